@@ -9,11 +9,14 @@ This page of the app contains bill information.
 """
 
 import os
-import pandas as pd
-import numpy as np
+import re
+from functools import partial
 import streamlit as st
 from utils import aggrid_styler
-from utils.utils import display_bill_info, to_csv, format_bill_history, ensure_set
+from utils.utils import display_bill_info
+from utils.exports import export_button
+from utils.bill_data import load_bills, load_topic_bills, load_categories, get_export_bills, load_data_version, EXPORT_COLS
+from utils.session_manager import initialize_session_state
 
 
 
@@ -34,64 +37,23 @@ st.write(
 
 ############################ LOAD AND SET UP DATA #############################
 
-# Load the data from a CSV. We're caching this so it doesn't reload every time the app
-# reruns (e.g. if the user interacts with the widgets).
-@st.cache_data
-def load_bill_data():
-    # load bill data
-    bills = pd.read_csv('/Users/danyasherbini/Documents/GitHub/lt-streamlit/data/bills.csv')
-    # Change chamber id to senate and assembly
-    bills['chamber'] = np.where(bills['origin_chamber_id']==1,'Assembly','Senate')
-    # load bill history data
-    bill_history = pd.read_csv('/Users/danyasherbini/Documents/GitHub/lt-streamlit/data/bill_history.csv')
-    # merge data sets
-    bills = pd.merge(bills, bill_history, how='left', on= 'bill_id')
-    # rename columns
-    bills = bills.rename(columns={'history_trace':'bill_history','bill_date':'date_introduced','bill_number':'bill_no'})
-    # reformat bill history column
-    bills['bill_history'] = bills['bill_history'].apply(ensure_set)
-    bills['bill_history'] = bills['bill_history'].apply(format_bill_history)
-    return bills
-
-bills = load_bill_data()
-
-
-# Additional data manipulation to bills df
-# Move bill_number column to first column
-numbers = bills['bill_no']
-bills.insert(0,'bill_number',numbers)
-# Drop some columns we don't need
-drop_cols = ['bill_no','bill_id','openstates_bill_id', 'committee_id', 'origin_chamber_id']
-bills = bills.drop(drop_cols, axis=1)
-# Sort by bill number by default
-bills = bills.sort_values('bill_number', ascending=True)
-
-
-# Get dataframes for AI bills, housing bills, and labor bills
-
-# AI bills
-ai_terms = ['artificial intelligence','algorithm','automated']
-ai_df = bills[bills['bill_name'].str.contains('|'.join(ai_terms),na=False,case=False)]
-ai_df = ai_df.sort_values('bill_number', ascending=True) # sort by bill number by default
-
-# Housing bills
-housing_terms = ['housing','eviction','tenants','renters']
-housing_df = bills[bills['bill_name'].str.contains('|'.join(housing_terms), na=False, case=False)]
-housing_df = housing_df.sort_values('bill_number', ascending=True) # sort by bill number by default
-
-# Labor bills
-labor_terms = ['worker','labor','gig economy','contract workers']
-labor_df = bills[bills['bill_name'].str.contains('|'.join(labor_terms), na=False, case=False)]
-labor_df = labor_df.sort_values('bill_number', ascending=True) # sort by bill number by default
-
-
-# Create page tabs
-tab1, tab2, tab3 , tab4 = st.tabs(['All Bills', 'AI', 'Housing', 'Labor'])
+# Load the display-ready bill data (columns dropped, bill_number first, sorted by bill number).
+# This is cached once per server process and shared by all pages (see utils/bill_data.py).
+bills = load_bills()
+
+
+
+# Topics to show as tabs. These come from data/topics.csv and are tagged when the bill store is
+# built (see utils/topics.py), so adding, renaming or removing a topic there changes the tabs.
+topics = load_categories()[1:]
+
+
+# Create page tabs: All Bills, then one per topic
+tab1, *topic_tabs = st.tabs(load_categories())
 
 
 # Initialize session state for selected bills
-if 'selected_bills' not in st.session_state:
-    st.session_state.selected_bills = []
+initialize_session_state()
 
 
 ############################### TAB 1: All Bills ###############################
@@ -104,12 +66,13 @@ with tab1:
 
     with col2:
         # Place the download button in the right column so it appears in the upper right hand corner of the page
-        st.download_button(
+        # (the file is only generated when the button is pressed, with the bill text and history added in)
+        export_button(
+            partial(get_export_bills, bills['bill_number']),
             key='all_bills_download',
-            label='Download Data as CSV',
-            data=to_csv(bills),
-            file_name='output.csv',
-            mime='text/csv',
+            cache_key=('bills', load_data_version(), ('All Bills',), tuple(bills.columns) + tuple(EXPORT_COLS)),
+            label='Download Data',
+            file_name='output',
             use_container_width=True
         )
 
@@ -121,86 +84,34 @@ with tab1:
 
     # If a row is selected, display bill info:
     if selected_rows is not None and len(selected_rows) != 0:
-        display_bill_info(selected_rows)
+        display_bill_info(selected_rows['bill_number'].iloc[0])
 
 
 
-############################### TAB 2: AI Bills ###############################
-with tab2:
-    st.header('AI Bills')
+########################### TOPIC TABS: one per topic ##########################
+for topic, tab in zip(topics, topic_tabs):
+    with tab:
+        st.header(f'{topic} Bills')
 
-    # Make the aggrid dataframe
-    data = aggrid_styler.draw_bill_grid(
-        ai_df)
-
-    # Define selected rows
-    selected_rows = data.selected_rows
-    
-    # If a row is selected, display bill info:
-    if selected_rows is not None:
-        if len(selected_rows) != 0:
-            display_bill_info(selected_rows)
-
-    # Button to download data as csv file       
-    st.download_button(key='ai_download',
-                       label='Download Full Data as CSV',
-                       data=to_csv(data['data']),
-                       file_name='output.csv',
-                       mime='text/csv'
-                       )
-        
-        
-############################# TAB 3: Housing Bills #############################
-
-with tab3:
-    # Title the page
-    st.header('Housing Bills')
-    
-    # Make the aggrid dataframe
-    data = aggrid_styler.draw_bill_grid(
-        housing_df)
+        # Key for this tab's widgets, e.g. 'housing'
+        key = re.sub(r'\W+', '_', topic.lower())
 
-    # Define selected rows
-    selected_rows = data.selected_rows
-    
-    # If a row is selected, display bill info:
-    if selected_rows is not None:
-        if len(selected_rows) != 0:
-            display_bill_info(selected_rows)
-
-    # Button to download data as csv file       
-    st.download_button(key='housing_download',
-                       label='Download Full Data as CSV',
-                       data=to_csv(data['data']),
-                       file_name='output.csv',
-                       mime='text/csv'
-                       )
-        
-    
-############################# TAB 4: Labor Bills ##############################
-
-with tab4: 
-    # Title the page
-    st.header('Labor Bills')
-    
-    # Make the aggrid dataframe
-    data = aggrid_styler.draw_bill_grid(
-        labor_df)
+        # Make the aggrid dataframe. Bills for the topic come from the topic index, so there's
+        # no need to search bill names here.
+        data = aggrid_styler.draw_bill_grid(
+            load_topic_bills(topic), key=f'{key}_grid')
 
-    # Define selected rows
-    selected_rows = data.selected_rows
-        
-    # If a row is selected, display bill info:
-    if selected_rows is not None:
-        if len(selected_rows) != 0:
-            display_bill_info(selected_rows)
-   
-    # Button to download data as csv file          
-    st.download_button(key='labor_download',
-                       label='Download Full Data as CSV',
-                       data=to_csv(data['data']),
-                       file_name='output.csv',
-                       mime='text/csv'
-                       )
+        # Define selected rows
+        selected_rows = data.selected_rows
 
+        # If a row is selected, display bill info:
+        if selected_rows is not None:
+            if len(selected_rows) != 0:
+                display_bill_info(selected_rows['bill_number'].iloc[0])
 
+        # Button to download data as a CSV, Parquet or Excel file (only generated when pressed, from the full rows of the bills in the grid, with their text and history)
+        export_button(partial(get_export_bills, data['data']['bill_number']),
+                      key=f'{key}_download',
+                      label='Download Full Data',
+                      file_name='output'
+                      )
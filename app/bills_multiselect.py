@@ -9,12 +9,14 @@ This page displays bill info, using a multi-select widget that allows users to f
 """
 
 import os
-import pandas as pd
-import numpy as np
+from functools import partial
 import streamlit as st
 from utils import aggrid_styler
-from utils.utils import display_bill_info, to_csv, format_bill_history, ensure_set
+from utils.utils import view_bill_button
+from utils.exports import export_button
+from utils.bill_data import ALL_BILLS, load_categories, select_bills, selection_key, load_data_version, get_export_bills, EXPORT_COLS
 from utils.session_manager import initialize_session_state
+from utils.dashboard_utils import add_to_dashboard_buttons
 
 # Set working directory
 PATH = '/Users/danyasherbini/Documents/GitHub/lt-streamlit'
@@ -31,45 +33,10 @@ st.write(
 
 ############################ LOAD AND SET UP DATA #############################
 
-@st.cache_data
-def load_bill_data():
-    # Load bill data
-    bills = pd.read_csv('/Users/danyasherbini/Documents/GitHub/lt-streamlit/data/bills.csv')
-    bills['chamber'] = np.where(bills['origin_chamber_id'] == 1, 'Assembly', 'Senate')
-    
-    # Load and merge bill history data
-    bill_history = pd.read_csv('/Users/danyasherbini/Documents/GitHub/lt-streamlit/data/bill_history.csv')
-    bills = pd.merge(bills, bill_history, how='left', on='bill_id')
-    
-    # Rename columns and format
-    bills = bills.rename(columns={'history_trace': 'bill_history', 'bill_date': 'date_introduced', 'bill_number': 'bill_no'})
-    bills['bill_history'] = bills['bill_history'].apply(ensure_set).apply(format_bill_history)
-    return bills
-
-bills = load_bill_data()
-
-# Additional data manipulation
-bills['bill_number'] = bills['bill_no']
-bills = bills.drop(['bill_no', 'bill_id', 'openstates_bill_id', 'committee_id', 'origin_chamber_id'], axis=1)
-bills = bills.sort_values('bill_number', ascending=True)
-
-# Filter DataFrames for specific topics
-ai_terms = ['artificial intelligence', 'algorithm', 'automated']
-ai_df = bills[bills['bill_name'].str.contains('|'.join(ai_terms), na=False, case=False)]
-
-housing_terms = ['housing', 'eviction', 'tenants', 'renters']
-housing_df = bills[bills['bill_name'].str.contains('|'.join(housing_terms), na=False, case=False)]
-
-labor_terms = ['worker', 'labor', 'gig economy', 'contract workers']
-labor_df = bills[bills['bill_name'].str.contains('|'.join(labor_terms), na=False, case=False)]
-
-# Create a dictionary for category mapping
-category_mapping = {
-    'All Bills': bills,
-    'AI': ai_df,
-    'Housing': housing_df,
-    'Labor': labor_df
-}
+# Bill categories: All Bills plus one per topic. Topics come from the topic index built when the
+# bill store is built (see utils/topics.py), so selecting categories is done with the topic index's
+# boolean columns and only the selected rows are taken from the bill data (see utils/bill_data.py).
+categories = load_categories()
 
 
 # Initialize session state for selected bills
@@ -79,40 +46,64 @@ initialize_session_state()
 # Multiselect widget for bill categories
 selected_categories = st.multiselect(
     'Select a category:',
-    options=list(category_mapping.keys()),
-    default=['All Bills']
+    options=categories,
+    default=[ALL_BILLS]
 )
 
-# Combine selected dataframes
+# Whether bills have to be in any or all of the selected categories, and categories to leave out
+col1, col2 = st.columns([1, 2])
+with col1:
+    match = st.radio(
+        'Show bills in:',
+        options=['any', 'all'],
+        format_func=lambda option: 'Any selected category' if option == 'any' else 'All selected categories',
+        horizontal=True
+    )
+with col2:
+    excluded_categories = st.multiselect(
+        'Exclude bills in:',
+        options=[category for category in categories if category != ALL_BILLS]
+    )
+
+# Select the bills in the chosen categories (one take from the bill data, cached per selection)
 if selected_categories:
-    combined_df = pd.concat([category_mapping[category] for category in selected_categories]).drop_duplicates()
+    selection = selection_key(selected_categories, match, excluded_categories)
+    combined_df = select_bills(selected_categories, match, excluded_categories)
 
     # Create a two-column layout: left for header, right for the button
     col1, col2 = st.columns([4, 1])  # Adjust column widths as needed
 
     with col1:
         # Header for the selected categories
-        st.markdown(f"### Displaying: {', '.join(selected_categories)}")
+        title = (' and ' if match == 'all' else ', ').join(selected_categories)
+        if excluded_categories:
+            title += f' (excluding {", ".join(excluded_categories)})'
+        st.markdown(f"### Displaying: {title}")
 
     with col2:
         # Display the download button in the right column
-        st.download_button(
-            label='Download Data as CSV',
-            data=to_csv(combined_df),
+        # (the file is only generated when the button is pressed, and it's cached by data version,
+        # category selection and columns, so users picking the same categories share one export;
+        # the bill text and history are added in when it's generated)
+        export_button(
+            partial(get_export_bills, combined_df['bill_number']),
+            cache_key=('bills', load_data_version(), selection, tuple(combined_df.columns) + tuple(EXPORT_COLS)),
+            label='Download Data',
             file_name='selected_bills.csv',
-            mime='text/csv',
             use_container_width=True
         )
     
     # Make the aggrid dataframe
-    data = aggrid_styler.draw_bill_grid(combined_df)
-    
-    # Define selected rows
-    selected_rows = data.selected_rows
+    data = aggrid_styler.draw_bill_grid(combined_df, selection='multiple')
     
-    # If a row is selected, display bill info
-    if selected_rows is not None and len(selected_rows) != 0:
-        display_bill_info(selected_rows)
+    # Define selected bills
+    selected = aggrid_styler.selected_bill_numbers(data)
+
+    # Button to display bill info for the selected bill (several rows can be selected, so it's not opened on selection)
+    view_bill_button(selected, key='selected_bills')
+
+    # Buttons to add the selected bills, or all bills in the grid (after filtering), to the dashboard
+    add_to_dashboard_buttons(selected, list(data['data']['bill_number']), key='selected_bills')
 
 else:
     st.write('Please select at least one category to display bills.')
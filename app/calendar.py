@@ -10,9 +10,9 @@ a custom streamlit component.
 """
 
 import os
-import pandas as pd
 import streamlit as st
 from streamlit_calendar import calendar
+from utils.calendar_data import load_calendar_events
 
 
 PATH = '/Users/danyasherbini/Documents/GitHub/lt-streamlit'
@@ -31,25 +31,9 @@ st.write(
 
 ############################ LOAD AND SET UP DATA #############################
 
-# Load the data from a CSV. We're caching this so it doesn't reload every time the app
-# reruns (e.g. if the user interacts with the widgets).
-@st.cache_data
-def load_calendar_data():
-    assembly_data = pd.read_csv('/Users/danyasherbini/Documents/GitHub/lt-streamlit/data/assembly_dates.csv')
-    return assembly_data
-
-assembly_data = load_calendar_data()
-
-# convert from csv to json format
-calendar_events = [
-    {
-        "title": row["title"],
-        "start": row["start"],
-        "end": row["end"],
-        "allDay": "true" if row["allDay"] else "false",
-    }
-    for _, row in assembly_data.iterrows()
-]
+# Load the calendar events. These are converted from the CSV once and cached (see
+# utils/calendar_data.py), so reruns (e.g. if the user interacts with the widgets) don't rebuild them.
+calendar_events = load_calendar_events()
 
 
 ################################## CALENDAR ###################################
@@ -6,13 +6,17 @@ Created on Nov 27, 2024
 @author: danyasherbini
 
 This page of the app features a calendar of legislative deadlines and/or events, built with
-html code (via streamlit html component)
+FullCalendar (via the calendar component in utils/fullcalendar.py, which ships its own copy of
+FullCalendar rather than loading it from a CDN)
 """
 
 import os
-import pandas as pd
+import datetime
 import streamlit as st
-from streamlit.components.v1 import html
+from utils.calendar_data import get_events_between, month_grid
+from utils.bill_deadlines import get_bill_events_between
+from utils.fullcalendar import fullcalendar
+from utils.session_manager import initialize_session_state
 
 
 PATH = '/Users/danyasherbini/Documents/GitHub/lt-streamlit'
@@ -29,27 +33,14 @@ st.write(
     '''
 )
 
-############################ LOAD AND SET UP DATA #############################
+# Initialize session state (the bills on the dashboard)
+initialize_session_state()
 
-# Load the data from a CSV. We're caching this so it doesn't reload every time the app
-# reruns (e.g. if the user interacts with the widgets).
-@st.cache_data
-def load_calendar_data():
-    assembly_data = pd.read_csv('/Users/danyasherbini/Documents/GitHub/lt-streamlit/data/assembly_dates.csv')
-    return assembly_data
-
-assembly_data = load_calendar_data()
-
-# convert from csv to json format
-calendar_events = [
-    {
-        'title': row['title'],
-        'start': row['start'],
-        'end': row['end'],
-        'allDay': 'true' if row['allDay'] else 'false',
-    }
-    for _, row in assembly_data.iterrows()
-]
+# Option to add hearings and upcoming deadlines for the bills on the dashboard
+show_bill_events = st.toggle(
+    'Show hearings and deadlines for my dashboard bills',
+    help='Hearings come from bill history. Deadlines are the next legislative calendar deadline for where each bill is in the process.',
+)
 
 ################################## CALENDAR ###################################
 
@@ -90,42 +81,34 @@ custom_css = """
 
 """
 
-# FullCalendar html with eventClick handling
-# https://fullcalendar.io
-calendar_html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-  <link href='https://cdn.jsdelivr.net/npm/fullcalendar@5.11.3/main.min.css' rel='stylesheet' />
-  <script src='https://cdn.jsdelivr.net/npm/fullcalendar@5.11.3/main.min.js'></script>
-  <style>
-    {custom_css} <!-- custom CSS here -->
-  </style>
-</head>
-<body>
-  <div id='calendar'></div>
-  <script>
-    document.addEventListener('DOMContentLoaded', function() {{
-      var calendarEl = document.getElementById('calendar');
-      var calendar = new FullCalendar.Calendar(calendarEl, {{
-        initialView: 'dayGridMonth',
-        headerToolbar: {{
-          left: 'prev,next today',
-          center: 'title',
-          right: 'dayGridMonth,dayGridWeek,listMonth'
-        }},
-        events: {calendar_events},  <!-- events are here -->
-        eventClick: function(info) {{
-          alert('Event: ' + info.event.title);
-        }}
-      }});
-      calendar.render();
-    }});
-  </script>
-</body>
-</html>
-"""
-
-
-# render the calendar in Streamlit
-html(calendar_html, height=600)
+# FullCalendar options (https://fullcalendar.io/docs). Clicking an event shows its title.
+calendar_options = {
+    'initialView': 'dayGridMonth',
+    'headerToolbar': {
+        'left': 'prev,next today',
+        'center': 'title',
+        'right': 'dayGridMonth,dayGridWeek,listMonth',
+    },
+}
+
+# Dates the calendar is showing: the range it sent back after the user moved it, or this
+# month to start with (the calendar opens on today's date)
+visible = st.session_state.get('calendar')
+if visible:
+    events_range = (visible['start'], visible['end'])
+else:
+    events_range = month_grid(datetime.date.today())
+
+# render the calendar in Streamlit, with just the events for the dates it's showing. The events
+# are converted from the CSV once, cached and indexed by date (see utils/calendar_data.py).
+events = get_events_between(*events_range)
+if show_bill_events:
+    events = events + get_bill_events_between(*events_range, numbers=st.session_state.selected_bills)
+fullcalendar(
+    events,
+    options=calendar_options,
+    custom_css=custom_css,
+    height=600,
+    events_range=events_range,
+    key='calendar',
+)
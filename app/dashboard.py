@@ -10,10 +10,10 @@ Page to add bills to user's private dashboard
 
 
 import streamlit as st
-import pandas as pd
 from utils.aggrid_styler import draw_bill_grid
 from utils.session_manager import initialize_session_state
-from utils.cache_manager import get_cached_bills, update_cached_bills
+from utils.bill_data import get_bills
+from utils.dashboard_utils import clear_dashboard
 
 # Initialize session state for selected bills
 initialize_session_state()
@@ -25,14 +25,14 @@ st.title('Dashboard')
 col1, col2 = st.columns([3, 1])
 with col2:
     if st.button('Clear Dashboard'):
-        st.session_state.selected_bills = []  # Clear session state
-        update_cached_bills([])  # Update cache with empty list
+        clear_dashboard()  # Clear session state and the saved dashboard
         st.success('Dashboard cleared!')
 
-# Display selected bills in the dashboard
+# Display selected bills in the dashboard. Session state only has the bill numbers (loaded from the
+# saved dashboard once per session), so look them up in the shared bill data.
 if st.session_state.selected_bills:
     st.write('Selected Bills:')
-    dashboard_df = pd.DataFrame(st.session_state.selected_bills)
+    dashboard_df = get_bills(list(st.session_state.selected_bills))
     draw_bill_grid(dashboard_df)
 else:
     st.write('No bills selected yet.')
@@ -9,11 +9,11 @@ This page of the app contains bill information.
 """
 
 import os
-import pandas as pd
-import numpy as np
 import streamlit as st
 from utils import aggrid_styler
-from utils.utils import to_csv
+from utils.exports import export_button
+from utils.utils import display_legislator_info
+from utils.legislator_data import load_legislators
 
 
 
@@ -33,26 +33,25 @@ st.write(
 
 ############################ LOAD AND SET UP DATA #############################
 
-# Load the data from a CSV. We're caching this so it doesn't reload every time the app
-# reruns (e.g. if the user interacts with the widgets).
-@st.cache_data
-def load_leg_data():
-    legislators = pd.read_csv('/Users/danyasherbini/Documents/GitHub/lt-streamlit/data/legislators.csv')
-    legislators['chamber'] = np.where(legislators['chamber_id']==1,'Assembly','Senate')
-    legislators = legislators.drop(['chamber_id'],axis=1)
-    return legislators
-
-legislators = load_leg_data()
+# Load the legislators. The data is loaded once and shared by all sessions, along with the
+# index that links legislators to their bills (see utils/legislator_data.py).
+legislators = load_legislators()
 
    
 # Make the aggrid dataframe
 data = aggrid_styler.draw_leg_grid(legislators)
 
-# Button to download data as csv file       
-st.download_button(key='legislators_download',
-                   label='Download Full Data as CSV',
-                   data=to_csv(data['data']),
-                   file_name='output.csv',
-                   mime='text/csv'
-                   )
+# Define selected rows
+selected_rows = data.selected_rows
+
+# If one row is selected, display legislator info:
+if selected_rows is not None and len(selected_rows) == 1:
+    display_legislator_info(int(selected_rows['legislator_id'].iloc[0]))
+
+# Button to download data as a CSV, Parquet or Excel file (the file is only generated when the button is pressed)
+export_button(data['data'],
+              key='legislators_download',
+              label='Download Full Data',
+              file_name='output'
+              )
 
@@ -0,0 +1,106 @@
+// FullCalendar component for streamlit (see utils/fullcalendar.py).
+//
+// Talks to streamlit with the component messages from streamlit-component-lib, so there's
+// nothing to build: tell streamlit the component is ready, draw the calendar when streamlit
+// sends the arguments, and report the height so the iframe fits the calendar.
+//
+// Streamlit only sends the events for a date range (args.events_range). When the user moves
+// the calendar to dates outside that range, the visible range is sent back as the component's
+// value, and the page reruns with the events for it.
+
+var calendar = null;
+var assets = null;
+var eventsRange = null;
+
+function sendMessage(type, data) {
+  window.parent.postMessage(Object.assign({isStreamlitMessage: true, type: type}, data), '*');
+}
+
+function setFrameHeight(height) {
+  sendMessage('streamlit:setFrameHeight', {height: height});
+}
+
+// Loads the FullCalendar files once, from the first of args.asset_urls (folders holding
+// main.min.css and main.min.js) that loads: the vendored copy if there is one, then the CDN.
+// Resolves when FullCalendar is ready.
+function loadAssets(urls) {
+  if (assets === null) {
+    assets = urls.reduce(function(loaded, url) {
+      return loaded.catch(function() { return loadAssetsFrom(url); });
+    }, Promise.reject());
+  }
+  return assets;
+}
+
+function loadAssetsFrom(url) {
+  return new Promise(function(resolve, reject) {
+    var css = document.createElement('link');
+    css.rel = 'stylesheet';
+    css.href = url + 'main.min.css';
+    document.head.insertBefore(css, document.getElementById('custom-css'));
+    var js = document.createElement('script');
+    js.src = url + 'main.min.js';
+    js.onload = resolve;
+    js.onerror = function() {
+      // take the files back out, so the next folder's don't load on top of them
+      css.remove();
+      js.remove();
+      reject();
+    };
+    document.head.appendChild(js);
+  });
+}
+
+function showMissingAssets(version) {
+  document.getElementById('calendar').innerHTML =
+    "<p class='missing-assets'>The calendar files (FullCalendar " + version + ") couldn't be " +
+    "loaded: they haven't been vendored and the CDN can't be reached. Run " +
+    "<code>python -m utils.fullcalendar</code> from the app folder.</p>";
+  setFrameHeight(document.body.scrollHeight);
+}
+
+// Asks streamlit for the events in the visible range, unless it has already sent them.
+// Dates are compared as YYYY-MM-DD strings.
+function datesSet(info) {
+  var start = info.startStr.slice(0, 10);
+  var end = info.endStr.slice(0, 10);
+  if (eventsRange !== null && eventsRange.start <= start && end <= eventsRange.end) {
+    return;
+  }
+  sendMessage('streamlit:setComponentValue', {value: {start: start, end: end}, dataType: 'json'});
+}
+
+function render(args) {
+  document.getElementById('custom-css').textContent = args.custom_css || '';
+  eventsRange = args.events_range || null;
+  if (calendar === null) {
+    var options = Object.assign({}, args.options, {
+      events: args.events,
+      height: args.height,
+      datesSet: datesSet,
+      eventClick: function(info) {
+        alert('Event: ' + info.event.title);
+      }
+    });
+    calendar = new FullCalendar.Calendar(document.getElementById('calendar'), options);
+    calendar.render();
+  } else {
+    // Redraw with the new events, keeping the date the user has navigated to
+    calendar.removeAllEventSources();
+    calendar.addEventSource(args.events);
+  }
+  setFrameHeight(args.height);
+}
+
+window.addEventListener('message', function(event) {
+  if (event.data.type !== 'streamlit:render') {
+    return;
+  }
+  var args = event.data.args;
+  loadAssets(args.asset_urls).then(
+    function() { render(args); },
+    function() { showMissingAssets(args.version); }
+  );
+});
+
+sendMessage('streamlit:componentReady', {apiVersion: 1});
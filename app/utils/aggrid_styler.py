@@ -10,15 +10,87 @@ which are clickable/editable data tables.
 
 """
 
+import math
+import streamlit as st
 from st_aggrid import AgGrid
 from st_aggrid.grid_options_builder import GridOptionsBuilder
 from st_aggrid.shared import GridUpdateMode
+from utils.grid_query import get_grid_index
+
+# Columns sent to the bills and legislators grids. The first column is the row key used to look
+# up the rest of a row server-side (e.g. bill text or coauthors when a bill is selected).
+BILL_GRID_COLS = ['bill_number', 'bill_name', 'author', 'status', 'date_introduced', 'chamber']
+LEG_GRID_COLS = ['legislator_id', 'name', 'district', 'party', 'chamber']
+
+# Columns searched by the search box in server-side mode, and the columns it can sort by
+BILL_SEARCH_COLS = ['bill_number', 'bill_name', 'author', 'status']
+BILL_SORT_COLS = {
+    'Bill Number': None, # bills are already sorted by bill number
+    'Bill Name': 'bill_name',
+    'Author': 'author',
+    'Status': 'status',
+    'Date Introduced': 'date_introduced',
+    'Chamber': 'chamber',
+}
+
+
+def server_side_query(df, key, page_size, search_cols, sort_cols, cache_key=None):
+    '''
+    Renders the search, sort and page controls for a server-side grid and answers the query
+    from the grid index in Python (cached on cache_key, see get_grid_index()). Returns the
+    rows for the current page and a container (placed above the page control) to draw the
+    grid in.
+    '''
+    col1, col2, col3 = st.columns([3, 2, 1], vertical_alignment='bottom')
+    with col1:
+        st.text_input('Search', key=f'{key}_search', placeholder='Search ' + ', '.join(search_cols))
+    with col2:
+        st.selectbox('Sort by', options=list(sort_cols), key=f'{key}_sort')
+    with col3:
+        st.toggle('Descending', key=f'{key}_descending')
+
+    # Container for the grid, so it shows up above the page control
+    grid_container = st.container()
+
+    # Find the matching rows first, so the page control knows how many pages there are
+    rows = server_side_match(df, key, search_cols, sort_cols, cache_key)
+    total = len(rows)
+    pages = max(1, math.ceil(total / page_size))
+    col1, col2 = st.columns([1, 5], vertical_alignment='bottom')
+    with col1:
+        page = st.number_input('Page', min_value=1, max_value=pages, value=1, key=f'{key}_page')
+    with col2:
+        st.caption(f'{total} bills, page {min(page, pages)} of {pages}')
+
+    start = (min(page, pages) - 1) * page_size
+    return df.take(rows[start:start + page_size]), grid_container
+
+
+def server_side_match(df, key, search_cols=BILL_SEARCH_COLS, sort_cols=BILL_SORT_COLS, cache_key=None):
+    '''
+    Returns the positions in df of all the rows matching a server-side grid's current search
+    and sort (on every page, not just the one shown), read from the grid's controls. The
+    query is memoized by the grid index, so calling this after drawing the grid is a lookup.
+    '''
+    search = st.session_state.get(f'{key}_search')
+    sort_label = st.session_state.get(f'{key}_sort') or next(iter(sort_cols))
+    descending = st.session_state.get(f'{key}_descending', False)
+    return get_grid_index(df, cache_key).match(search, search_cols, sort_by=sort_cols[sort_label], descending=descending)
+
+
+def selected_bill_numbers(data):
+    '''
+    Returns the bill numbers of the rows selected in a bill grid (an empty list if none are).
+    '''
+    selected_rows = data.selected_rows
+    return [] if selected_rows is None else list(selected_rows['bill_number'])
+
 
 # Ag grid styler function for bills table
 def draw_bill_grid(
         df,
         formatter: dict = None,
-        selection='single',
+        selection='single', # 'multiple' to select several rows at once (e.g. to add them all to the dashboard)
         use_checkbox=True,
         #header_checkbox = True, -- turned off for now
         fit_columns=False, # change to true to make all columns the same width/fit to the table width
@@ -27,23 +99,35 @@ def draw_bill_grid(
         wrap_text: bool = False,
         auto_height: bool = False,
         key=None,
-        css: dict = None
+        css: dict = None,
+        server_side: bool = False, # filter, sort and page in Python and only send the current page to the grid
+        page_size: int = 100,
+        cache_key=None, # identifies the data for the server-side grid index, e.g. ('bills', load_data_version())
+        columns: list = BILL_GRID_COLS # columns to send to the grid (bill_number is the row key)
 ):
 
+    # In server-side mode, search/sort/page controls are shown above the grid, and the
+    # grid only gets the rows for the current page
+    if server_side:
+        df, grid_container = server_side_query(df, key or 'bill_grid', page_size, BILL_SEARCH_COLS, BILL_SORT_COLS, cache_key)
+    else:
+        grid_container = st.container()
+
+    # Only send the displayed columns to the grid, rather than sending everything and hiding columns
+    df = df[[col for col in columns if col in df.columns]]
+
     # Initialize the GridOptionsBuilder from the dataframe passed into the function
     builder = GridOptionsBuilder().from_dataframe(df)
     
     # Configure default column settings for all columns
     builder.configure_default_column(
-        enableFilter=True,
+        enableFilter=not server_side, # filtering and sorting happen in Python in server-side mode
+        sortable=not server_side,
         filter='agTextColumnFilter',
-        floatingFilter=True, # floating filter: adds a row under the header row for the filter
+        floatingFilter=not server_side, # floating filter: adds a row under the header row for the filter
         #columnSize='sizeToFit'
         )
     
-    # Configure special settings for certain columns (batch)
-    builder.configure_columns(['full_text','leginfo_link','coauthors','bill_history','leg_session'],hide=True) # hide these columns in the initial dataframe
-    
     # Configure special settings for individual columns
     #builder.configure_column('checkbox', headerName='', checkboxSelection=True, width=50, pinned='left') # option to add a specific checkbox column
     builder.configure_column('bill_number',headerName = 'Bill Number',pinned='left', checkboxSelection=True) # pin this column, make it the checkbox column
@@ -53,31 +137,43 @@ def draw_bill_grid(
     builder.configure_column('date_introduced',headerName = 'Date Introduced',filter='agDateColumnFilter')
     builder.configure_column('chamber',headerName = 'Chamber',filter='agSetColumnFilter')
     
-    # Configure how user selects rows -- don't need this as already have it turned on above
-    #builder.configure_selection(selection_mode=selection, use_checkbox=use_checkbox)
+    # In server-side mode the grid only has one page of rows, so turn off column filters (the search box replaces them)
+    if server_side:
+        builder.configure_columns(list(df.columns), filter=False, floatingFilter=False)
+    
+    # Configure how user selects rows. With multiple selection, the header checkbox selects all
+    # the rows that pass the grid's filters.
+    builder.configure_selection(
+        selection_mode=selection,
+        use_checkbox=use_checkbox,
+        header_checkbox=(selection == 'multiple'),
+        header_checkbox_filtered_only=True,
+        rowMultiSelectWithClick=(selection == 'multiple'),
+        )
     
     # Build the grid options dictionary
     grid_options = builder.build()
 
-    return AgGrid(
-        df,
-        gridOptions=grid_options, # pass the grid options dictionary built above
-        update_mode=GridUpdateMode.SELECTION_CHANGED | GridUpdateMode.VALUE_CHANGED, # ensures the df is updated dynamically
-        allow_unsafe_jscode=True,
-        fit_columns_on_grid_load=fit_columns,
-        max_height=max_height,
-        theme=theme,
-        key=key,
-        css=css
-    )
+    with grid_container:
+        return AgGrid(
+            df,
+            gridOptions=grid_options, # pass the grid options dictionary built above
+            update_mode=GridUpdateMode.SELECTION_CHANGED | GridUpdateMode.VALUE_CHANGED, # ensures the df is updated dynamically
+            allow_unsafe_jscode=True,
+            fit_columns_on_grid_load=fit_columns,
+            max_height=max_height,
+            theme=theme,
+            key=key,
+            css=css
+        )
 
 
 # Ag grid styler function for legislators table
 def draw_leg_grid(
         df,
         formatter: dict = None,
-        #selection='single', -- selection turned off for legislators table
-        #use_checkbox=True, -- turned off for legislators table
+        selection='single', # select a legislator to see their details
+        use_checkbox=True,
         #header_checkbox = True, -- turned off for legislators table
         fit_columns=True, # change to false to make all column width based on the variable
         theme='streamlit',
@@ -85,9 +181,13 @@ def draw_leg_grid(
         wrap_text: bool = False,
         auto_height: bool = False,
         key=None,
-        css: dict = None
+        css: dict = None,
+        columns: list = LEG_GRID_COLS # columns to send to the grid (legislator_id is the row key)
 ):
 
+    # Only send the displayed columns (plus the row key) to the grid
+    df = df[[col for col in columns if col in df.columns]]
+
     # Initialize the GridOptionsBuilder from the dataframe passed into the function
     builder = GridOptionsBuilder().from_dataframe(df)
     
@@ -100,16 +200,16 @@ def draw_leg_grid(
         )
     
     # Configure special settings for certain columns (batch)
-    builder.configure_columns(['legislator_id'],hide=True)
+    builder.configure_columns(['legislator_id'],hide=True) # row key, sent but not shown
     
     # Configure special settings for individual columns 
-    builder.configure_column('name',pinned='left',headerName = 'Name', filter='agSetColumnFilter') 
+    builder.configure_column('name',pinned='left',headerName = 'Name', filter='agSetColumnFilter', checkboxSelection=use_checkbox) # make it the checkbox column
     builder.configure_column('district',headerName = 'District',filter='agNumberColumnFilter', headerClass='left-align-header') # left align to make sure column header is justified left like the rest of the columns
     builder.configure_column('party',headerName = 'Party',filter='agSetColumnFilter')
     builder.configure_column('chamber',headerName = 'Chamber',filter='agSetColumnFilter')
     
-    # Configure how user selects rows -- turned off for legislators table
-    #builder.configure_selection(selection_mode=selection, use_checkbox=use_checkbox)
+    # Configure how user selects rows
+    builder.configure_selection(selection_mode=selection, use_checkbox=use_checkbox)
     
     # Build the grid options dictionary
     grid_options = builder.build()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bill Data
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Shared data access for the bill pages. The bill data is loaded once per server process and
+the same dataframe is shared by every page and every session, instead of each page keeping its
+own cached copy.
+"""
+
+import json
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.bill_store import load_bill_store, load_history_store, connect_text_store, store_version, TOPIC_PREFIX
+from utils.bill_history import render_history, render_histories
+
+# Columns from the bill store that the bill pages don't use
+DROP_COLS = ['bill_id', 'openstates_bill_id', 'committee_id', 'origin_chamber_id']
+
+# Columns added to the bill rows in downloads (see get_export_bills()): the bill text from the
+# text store and the rendered history
+EXPORT_COLS = ['full_text', 'bill_history']
+
+# Category that selects every bill, listed with the topics on the category pages
+ALL_BILLS = 'All Bills'
+
+###############################################################################
+
+# Cached with st.cache_resource rather than st.cache_data: st.cache_data pickles the return
+# value and hands every caller its own copy, while st.cache_resource returns the same object.
+@st.cache_resource
+def load_bill_data():
+    '''
+    Returns the merged bill data. This is a single dataframe shared across all pages and
+    sessions, so treat it as read-only: use methods that return a new frame (drop, assign,
+    filtering, etc.) rather than modifying it in place.
+    '''
+    return load_bill_store()
+
+
+@st.cache_resource
+def load_data_version():
+    '''
+    Returns the version of the bill store that load_bill_data() was loaded from (see
+    store_version() in utils/bill_store.py), for keying caches of data derived from it.
+    '''
+    load_bill_data()
+    return store_version()
+
+
+@st.cache_resource
+def load_bills():
+    '''
+    Returns the display-ready bill data used by the bill pages: unused columns dropped,
+    bill_number as the first column and bills naturally sorted by bill number (the bill
+    store is already sorted). Built once per process and shared (read-only) like
+    load_bill_data(), so page reruns don't have to copy or re-sort the data.
+    '''
+    bills = load_bill_data()
+    # Drop some columns we don't need, including the topic tags (see load_topic_index)
+    topic_cols = [col for col in bills.columns if col.startswith(TOPIC_PREFIX)]
+    bills = bills.drop(DROP_COLS + topic_cols, axis=1).rename(columns={'bill_no': 'bill_number'})
+    # Move bill_number column to first column
+    bills = bills[['bill_number'] + [col for col in bills.columns if col != 'bill_number']]
+    # Renumber rows so the index is the row position
+    bills = bills.reset_index(drop=True)
+    return bills
+
+
+@st.cache_resource
+def load_bill_positions():
+    '''
+    Returns a dictionary of bill number -> row position in load_bills(), for looking up bills
+    by number (e.g. to fill in the columns that aren't sent to the grids).
+    '''
+    bills = load_bills()
+    return dict(zip(bills['bill_number'], range(len(bills))))
+
+
+def get_bills(numbers):
+    '''
+    Returns the full rows of load_bills() for the given bill numbers, in the given order.
+    Bill numbers that aren't found are skipped.
+    '''
+    positions = load_bill_positions()
+    return load_bills().take([positions[number] for number in numbers if number in positions])
+
+
+def get_bill(number):
+    '''
+    Returns the full row for one bill as a series (None if the bill number isn't found).
+    '''
+    position = load_bill_positions().get(number)
+    return None if position is None else load_bills().iloc[position]
+
+
+def split_names(names):
+    '''
+    Splits a comma-separated list of names (e.g. coauthors) into a list. Missing values give
+    an empty list.
+    '''
+    if not isinstance(names, str):
+        return []
+    return [name.strip() for name in names.split(',') if name.strip()]
+
+
+# Cached per bill, so reopening a bill is a lookup. Bounded, since a session only opens a
+# handful of bills and there are thousands.
+@st.cache_resource(max_entries=1000)
+def load_bill_record(number):
+    '''
+    Returns everything the bill info dialog shows for one bill, already formatted, as a
+    dictionary (None if the bill number isn't found). Bill text isn't included; it's looked
+    up in the text store when it's shown (see get_bill_text()).
+    '''
+    bill = get_bill(number)
+    if bill is None:
+        return None
+    return {
+        'number': bill['bill_number'],
+        'name': bill['bill_name'],
+        'author': bill['author'],
+        'coauthors': split_names(bill['coauthors']),
+        'status': bill['status'],
+        'date_introduced': bill['date_introduced'],
+        'session': bill['leg_session'],
+        'chamber': bill['chamber'],
+        'link': str(bill['leginfo_link']),
+        'history': get_bill_history_markdown(number),
+    }
+
+
+@st.cache_resource
+def load_topic_index():
+    '''
+    Returns the topic index for load_bills(): a boolean dataframe with one column per topic
+    (see utils/topics.py), aligned with the rows of load_bills(). Topics are tagged when the
+    bill store is built, so this just picks the topic columns out of the store.
+    '''
+    bills = load_bill_data()
+    topic_cols = [col for col in bills.columns if col.startswith(TOPIC_PREFIX)]
+    topic_index = bills[topic_cols].reset_index(drop=True)
+    return topic_index.rename(columns=lambda col: col[len(TOPIC_PREFIX):])
+
+
+@st.cache_resource
+def load_topic_bills(topic):
+    '''
+    Returns the bills tagged with the given topic, in the same order as load_bills().
+    Cached per topic, so switching tabs or categories is just a lookup.
+    '''
+    bills = load_bills()
+    topic_index = load_topic_index()
+    return bills[topic_index[topic]]
+
+
+def load_categories():
+    '''
+    Returns the bill categories: All Bills, then one per topic.
+    '''
+    return [ALL_BILLS] + list(load_topic_index().columns)
+
+
+def category_mask(category):
+    '''
+    Returns a boolean array over the rows of load_bills(), True for the bills in a category.
+    '''
+    if category == ALL_BILLS:
+        return np.ones(len(load_bills()), dtype=bool)
+    return load_topic_index()[category].to_numpy(dtype=bool)
+
+
+def select_positions(categories, match='any', exclude=()):
+    '''
+    Returns the row positions in load_bills() of the bills in the given categories: in any of
+    them (match='any', a union) or in all of them (match='all', an intersection), minus the
+    bills in any of the exclude categories. Works on the topic index's boolean columns, so
+    it doesn't look at the bill data itself.
+    '''
+    if match not in ('any', 'all'):
+        raise ValueError(f"match must be 'any' or 'all', not {match!r}")
+    masks = [category_mask(category) for category in categories]
+    if not masks:
+        mask = np.zeros(len(load_bills()), dtype=bool)
+    elif match == 'any':
+        mask = np.logical_or.reduce(masks)
+    else:
+        mask = np.logical_and.reduce(masks)
+    for category in exclude:
+        mask &= ~category_mask(category)
+    return np.flatnonzero(mask)
+
+
+# Cached so repeating a selection (from any session) returns the same frame, which also lets
+# caches keyed on the frame (e.g. grid indexes, see utils/grid_query.py) be reused.
+@st.cache_resource(max_entries=32)
+def _load_selection(categories, match, exclude):
+    return load_bills().take(select_positions(categories, match, exclude))
+
+
+def selection_key(categories, match='any', exclude=()):
+    '''
+    Returns a category selection in a normal form (sorted tuples), so selections that only
+    differ in the order categories were picked share caches.
+    '''
+    return tuple(sorted(categories)), match, tuple(sorted(exclude))
+
+
+def select_bills(categories, match='any', exclude=()):
+    '''
+    Returns the bills selected by categories (see select_positions()) in bill number order,
+    with a single take() from load_bills(). Shared and read-only like load_bills().
+    '''
+    return _load_selection(*selection_key(categories, match, exclude))
+
+
+###############################################################################
+
+@st.cache_resource
+def load_bill_history():
+    '''
+    Returns the bill history table (see utils/bill_history.py): one row per history entry
+    with bill_id, bill_number, date, chamber and action, sorted chronologically within each
+    bill. Shared and read-only like load_bill_data().
+    '''
+    return load_history_store()
+
+
+@st.cache_resource
+def load_history_slices():
+    '''
+    Returns a dictionary of bill number -> slice of that bill's rows in load_bill_history().
+    Each bill's rows are stored together, so this is all that's needed to pull up one bill's
+    history without scanning the table.
+    '''
+    numbers = load_bill_history()['bill_number'].to_numpy()
+    if len(numbers) == 0:
+        return {}
+    starts = np.flatnonzero(np.r_[True, numbers[1:] != numbers[:-1]])
+    stops = np.r_[starts[1:], len(numbers)]
+    return {numbers[start]: slice(start, stop) for start, stop in zip(starts, stops)}
+
+
+def get_bill_history(number):
+    '''
+    Returns the history table rows for one bill, oldest first (empty if it has no history).
+    '''
+    history = load_bill_history()
+    return history.iloc[load_history_slices().get(number, slice(0, 0))]
+
+
+def get_bill_history_markdown(number):
+    '''
+    Renders one bill's history as Markdown for display with st.markdown().
+    '''
+    return render_history(get_bill_history(number))
+
+
+@st.cache_resource
+def load_latest_actions():
+    '''
+    Returns each bill's most recent history entry (date, chamber and action), indexed by
+    bill number. Bills with no history are left out.
+    '''
+    history = load_bill_history()
+    last_rows = [rows.stop - 1 for rows in load_history_slices().values()]
+    return history.iloc[last_rows].set_index('bill_number')[['date', 'chamber', 'action']]
+
+
+def days_since_last_action(today=None):
+    '''
+    Returns the number of days since each bill's most recent action, indexed by bill number.
+    '''
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    return (today - load_latest_actions()['date']).dt.days
+
+
+@st.cache_resource
+def load_history_by_date():
+    '''
+    Returns the bill history table sorted by date across all bills, for date-range queries.
+    '''
+    history = load_bill_history().dropna(subset=['date'])
+    return history.sort_values('date', kind='stable').reset_index(drop=True)
+
+
+def get_history_between(start, end):
+    '''
+    Returns every history entry dated between start and end (inclusive), in date order.
+    '''
+    history = load_history_by_date()
+    first = history['date'].searchsorted(pd.Timestamp(start), side='left')
+    last = history['date'].searchsorted(pd.Timestamp(end), side='right')
+    return history.iloc[first:last]
+
+
+###############################################################################
+
+@st.cache_resource
+def load_text_connection():
+    '''
+    Returns a shared, read-only connection to the bill text store (see utils/bill_store.py).
+    '''
+    return connect_text_store()
+
+
+def get_bill_text(number):
+    '''
+    Returns the full text of one bill, looked up by bill number (None if there's no text).
+    '''
+    conn = load_text_connection()
+    row = conn.execute('SELECT full_text FROM bill_text WHERE bill_number = ?', (str(number),)).fetchone()
+    return row[0] if row else None
+
+
+def get_bill_texts(numbers):
+    '''
+    Returns the full text of the given bills as a dictionary of bill number -> text, looked up
+    in one query (bills without text are left out).
+    '''
+    conn = load_text_connection()
+    # the numbers are passed as one JSON array, so there's no limit on how many there are
+    rows = conn.execute(
+        'SELECT bill_number, full_text FROM bill_text WHERE bill_number IN (SELECT value FROM json_each(?))',
+        (json.dumps([str(number) for number in numbers]),),
+    ).fetchall()
+    return dict(rows)
+
+
+###############################################################################
+
+def get_export_bills(numbers):
+    '''
+    Returns the rows to download for the given bill numbers: the full rows of load_bills(),
+    plus each bill's full text and its history rendered as Markdown (EXPORT_COLS), which
+    aren't kept in the shared bill data.
+    '''
+    bills = get_bills(numbers)
+    numbers = bills['bill_number']
+    history = load_bill_history()
+    history = history[history['bill_number'].isin(numbers)]
+    return bills.assign(
+        full_text=numbers.map(get_bill_texts(numbers)).astype(object),
+        bill_history=numbers.map(render_histories(history)).fillna('').astype(object),
+    )
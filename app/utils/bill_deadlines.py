@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bill Deadlines
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Calendar events for individual bills, derived from bill history and status: committee
+hearings from the history actions, and each bill's next deadline from the legislative
+calendar (assembly_dates.csv).
+
+Hearings are put on the date of the hearing, which is read from the action's text (e.g.
+'April 9 set for first hearing.' is logged days or weeks before April 9), not on the date the
+action was logged. Hearing actions without a date, and canceled or postponed hearings, are
+left out.
+
+Where a bill is in the process (its house of origin, the second house, waiting on the
+Governor, or done) is worked out from its history and status. Deadlines from the legislative
+calendar are tagged with the stage they apply to and the legislative session they fall in.
+Then every bill that's still alive is matched to the first deadline for its session and stage
+on or after its latest action with one pd.merge_asof over both tables, sorted by date, instead
+of a loop over bills and deadlines. Bills that are done (chaptered, vetoed or dead) get no
+deadline, and neither do bills from a session the calendar has no deadlines for.
+
+BillDeadlines is kept up to date incrementally. When the bill data changes, only the bills
+whose history or status changed are re-staged and re-joined against the deadlines, so new
+history for a few bills doesn't redo the join or the events for every bill. A new calendar
+starts over, since every bill's deadline can change.
+"""
+
+import threading
+import numpy as np
+import pandas as pd
+import streamlit as st
+from utils.bill_data import load_bill_history, load_bills, load_data_version
+from utils.calendar_data import EventStore, events_from_frame, calendar_data_version, load_calendar_data
+
+# Stages of a bill, in order (a bill only moves forward)
+STAGE_ORIGIN = 0        # in its house of origin
+STAGE_SECOND_HOUSE = 1  # passed its house of origin
+STAGE_GOVERNOR = 2      # passed both houses, waiting on the Governor
+STAGE_DONE = 3          # chaptered, vetoed or dead: no more deadlines
+
+# Actions that move a bill to a stage (checked on every history entry)
+ACTION_STAGES = [
+    (STAGE_DONE, r'Chaptered by Secretary of State|Approved by the Governor|Vetoed|^Died\b|pursuant to Joint Rule 56'),
+    (STAGE_GOVERNOR, r'Enrolled and presented to the Governor'),
+    (STAGE_SECOND_HOUSE, r'^In (?:Assembly|Senate)\b'), # e.g. 'In Senate. Read first time.'
+]
+
+# Statuses that put a bill in a stage, whatever its history says
+STATUS_STAGES = {
+    'Chaptered': STAGE_DONE,
+    'Vetoed': STAGE_DONE,
+    'Dead': STAGE_DONE,
+    'Died': STAGE_DONE,
+    'Failed': STAGE_DONE,
+    'Enrolled': STAGE_GOVERNOR,
+}
+
+# Legislative calendar dates that are deadlines for bills in a stage (matched on the title)
+DEADLINE_STAGES = [
+    (STAGE_ORIGIN, r'introduced in (?:their|that) house'),
+    (STAGE_SECOND_HOUSE, r'^Last day for (?:policy|fiscal) committees to hear and report bills|^Last day to amend on the Floor|^Last day for each house to pass bills\.'),
+    (STAGE_GOVERNOR, r'Governor to sign or veto'),
+]
+
+# History actions that are committee hearings, and the hearing's date in them (e.g. 'April 9
+# set for first hearing.', 'Apr. 9 hearing: Held in committee and under submission.')
+HEARING_RE = r'hearing'
+NOT_HEARING_RE = r'canceled|cancelled|postponed'
+HEARING_DATE_RE = r'\b(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+(\d{1,2})\b'
+
+# Event colors on the calendar
+DEADLINE_COLOR = '#d9534f'
+HEARING_COLOR = '#5b8def'
+
+###############################################################################
+
+def action_stages(actions):
+    '''
+    Returns the stage each history action moves a bill to (STAGE_ORIGIN if it doesn't move it).
+    '''
+    conditions = [actions.str.contains(pattern, regex=True, na=False).to_numpy() for _, pattern in ACTION_STAGES]
+    return np.select(conditions, [stage for stage, _ in ACTION_STAGES], default=STAGE_ORIGIN)
+
+
+def leg_sessions(dates):
+    '''
+    Returns the legislative session (e.g. '2025-2026', as in the bills' leg_session) that each
+    date falls in. Sessions start in odd-numbered years.
+    '''
+    start = dates.dt.year - (dates.dt.year + 1) % 2
+    return start.astype(str) + '-' + (start + 1).astype(str)
+
+
+def deadlines_from_calendar(data):
+    '''
+    Returns the legislative calendar dates that are bill deadlines, tagged with the stage they
+    apply to and the session they're in: a dataframe with stage, leg_session, date and title,
+    sorted by date.
+    '''
+    titles = data['title']
+    conditions = [titles.str.contains(pattern, regex=True, na=False).to_numpy() for _, pattern in DEADLINE_STAGES]
+    stages = np.select(conditions, [stage for stage, _ in DEADLINE_STAGES], default=-1)
+    dates = pd.to_datetime(data['start'])
+    deadlines = pd.DataFrame({'stage': stages, 'leg_session': leg_sessions(dates), 'date': dates, 'title': titles})
+    deadlines = deadlines[deadlines['stage'] >= 0]
+    return deadlines.sort_values('date', kind='stable').reset_index(drop=True)
+
+
+def hearings_from_history(history):
+    '''
+    Returns the committee hearings in history rows: bill_number, date (the hearing's date, from
+    the action's text) and action. The year is the year the action was logged, or the next one
+    for a date more than six months before it (e.g. a January hearing set in December). Where a
+    bill has several actions for the same hearing (e.g. set for hearing, then its outcome), the
+    last one is kept.
+    '''
+    actions = history['action']
+    hearings = history[
+        actions.str.contains(HEARING_RE, case=False, regex=True, na=False).to_numpy()
+        & ~actions.str.contains(NOT_HEARING_RE, case=False, regex=True, na=False).to_numpy()
+    ]
+    parts = hearings['action'].str.extract(HEARING_DATE_RE, expand=True)
+    logged = hearings['date']
+    dates = pd.to_datetime(
+        logged.dt.year.astype('Int64').astype(str) + ' ' + parts[0].astype(str) + ' ' + parts[1].astype(str),
+        format='%Y %b %d', errors='coerce',
+    )
+    dates = dates.where(dates >= logged - pd.Timedelta(days=183), dates + pd.DateOffset(years=1))
+    hearings = pd.DataFrame({
+        'bill_number': hearings['bill_number'].astype(object),
+        'date': dates.astype('datetime64[us]'),
+        'action': hearings['action'].astype(object),
+    }).dropna(subset=['date'])
+    return hearings.drop_duplicates(['bill_number', 'date'], keep='last').reset_index(drop=True)
+
+
+class BillDeadlines:
+    '''
+    Per-bill calendar events: hearings from bill history, and each bill's next deadline from
+    the legislative calendar. deadlines is from deadlines_from_calendar(). Starts empty; call
+    update() with the bills to add or change, or sync() with all the bill data to update the
+    bills that changed since the last sync.
+    '''
+
+    def __init__(self, deadlines):
+        self.deadlines = deadlines.astype({'stage': 'int64', 'leg_session': object})
+        # where each bill is: its session, the date of its latest action, and the furthest
+        # stage reached in its history and in its status
+        self.state = pd.DataFrame(
+            {
+                'leg_session': pd.Series(dtype=object),
+                'last_date': pd.Series(dtype='datetime64[us]'),
+                'history_stage': pd.Series(dtype='int64'),
+                'status_stage': pd.Series(dtype='int64'),
+            },
+            index=pd.Index([], dtype=object, name='bill_number'),
+        )
+        # each bill's next deadline (bills without one are left out)
+        self.next_deadlines = pd.DataFrame(
+            {'date': pd.Series(dtype='datetime64[us]'), 'title': pd.Series(dtype=object)},
+            index=pd.Index([], dtype=object, name='bill_number'),
+        )
+        self._hearings = hearings_from_history(pd.DataFrame({
+            'bill_number': pd.Series(dtype=object),
+            'date': pd.Series(dtype='datetime64[us]'),
+            'action': pd.Series(dtype=object),
+        }))
+        self._events = None
+        # the version and bill signatures (see bill_signatures()) from the last sync(), to find
+        # what changed in the next one
+        self.version = None
+        self._signatures = None
+        self._lock = threading.RLock()
+
+    def update(self, history, bills):
+        '''
+        Re-stages some bills and re-joins them against the deadlines. history has every
+        history row (bill_number, date and action) of the bills being updated, and bills their
+        bill_number, leg_session and status; these replace whatever was there for them. Bills
+        in neither are dropped. Returns the bill numbers that were updated.
+        '''
+        numbers = pd.Index(history['bill_number'].astype(object).unique()).union(pd.Index(bills['bill_number'].astype(object).unique()))
+        history = history.dropna(subset=['date'])
+        bills = bills.drop_duplicates('bill_number', keep='last').set_index('bill_number')
+        bills.index = bills.index.astype(object)
+
+        # latest action and furthest stage reached in each bill's history
+        latest = history[['bill_number', 'date']].assign(stage=action_stages(history['action'])) \
+            .groupby('bill_number', sort=False).agg(last_date=('date', 'max'), history_stage=('stage', 'max'))
+        latest.index = latest.index.astype(object)
+        status = bills['status'].astype(object)
+        state = pd.DataFrame({
+            'leg_session': bills['leg_session'].astype(object).reindex(numbers),
+            'last_date': latest['last_date'].reindex(numbers),
+            'history_stage': latest['history_stage'].reindex(numbers).fillna(STAGE_ORIGIN).astype('int64'),
+            'status_stage': status.map(STATUS_STAGES).reindex(numbers).fillna(STAGE_ORIGIN).astype('int64'),
+        }, index=numbers)
+        state = state[state['leg_session'].notna() | state['last_date'].notna()]
+        state.index.name = 'bill_number'
+
+        with self._lock:
+            self.state = pd.concat([self.state.drop(numbers, errors='ignore'), state])
+            hearings = self._hearings
+            self._hearings = pd.concat(
+                [hearings[~hearings['bill_number'].isin(numbers)], hearings_from_history(history)], ignore_index=True
+            )
+            self._join(numbers)
+            self._events = None
+        return numbers
+
+    def sync(self, history, bills, version):
+        '''
+        Brings the events up to date with the bill data: history is the whole history table,
+        bills the whole bill table (with bill_number, leg_session and status) and version
+        identifies the data (e.g. load_data_version()). Only the bills whose history rows,
+        session or status differ from the last sync (by their bill_signatures()) are updated.
+        Returns the bill numbers that were updated.
+        '''
+        with self._lock:
+            if version == self.version:
+                return pd.Index([], dtype=object)
+            signatures = bill_signatures(history[['bill_number', 'date', 'action']]), \
+                bill_signatures(bills[['bill_number', 'leg_session', 'status']])
+            if self.version is None:
+                updated = self.update(history, bills)
+            else:
+                numbers = _changed(self._signatures[0], signatures[0]).union(_changed(self._signatures[1], signatures[1]))
+                updated = numbers
+                if len(numbers):
+                    updated = self.update(
+                        history[history['bill_number'].isin(numbers)], bills[bills['bill_number'].isin(numbers)]
+                    )
+            self.version, self._signatures = version, signatures
+            return updated
+
+    def _join(self, numbers):
+        # each live bill's next deadline: the first deadline for its session and stage on or
+        # after its latest action, found with one as-of join over both tables sorted by date
+        bills = self.state.reindex(numbers).dropna(subset=['leg_session', 'last_date'])
+        bills = pd.DataFrame({
+            'bill_number': bills.index,
+            'leg_session': bills['leg_session'].to_numpy(),
+            'last_date': bills['last_date'].to_numpy(),
+            'stage': np.maximum(bills['history_stage'], bills['status_stage']).to_numpy(),
+        }).astype({'leg_session': object})
+        bills = bills[bills['stage'] < STAGE_DONE].sort_values('last_date', kind='stable')
+        joined = pd.merge_asof(
+            bills, self.deadlines, left_on='last_date', right_on='date', by=['leg_session', 'stage'],
+            direction='forward',
+        ).dropna(subset=['date']).set_index('bill_number')[['date', 'title']]
+        self.next_deadlines = pd.concat([self.next_deadlines.drop(numbers, errors='ignore'), joined])
+
+    def hearings(self):
+        '''
+        Returns every hearing in the bill history (bill_number, date of the hearing, action).
+        '''
+        return self._hearings
+
+    def events(self):
+        '''
+        Returns the hearings and next deadlines as an EventStore of FullCalendar events (see
+        utils/calendar_data.py). Each event has the bill's number in bill_number. Rebuilt
+        after an update, the first time it's asked for.
+        '''
+        with self._lock:
+            if self._events is None:
+                hearings = self.hearings()
+                deadlines = self.next_deadlines
+                frame = pd.concat([
+                    pd.DataFrame({
+                        'title': hearings['bill_number'] + ': ' + hearings['action'],
+                        'start': hearings['date'].dt.strftime('%Y-%m-%d'),
+                        'bill_number': hearings['bill_number'],
+                        'color': HEARING_COLOR,
+                    }),
+                    pd.DataFrame({
+                        'title': deadlines.index.to_series() + ': ' + deadlines['title'].astype(object),
+                        'start': deadlines['date'].dt.strftime('%Y-%m-%d'),
+                        'bill_number': deadlines.index,
+                        'color': DEADLINE_COLOR,
+                    }),
+                ], ignore_index=True).assign(end=None, allDay=True)
+                self._events = EventStore(events_from_frame(frame, extra_cols=['bill_number', 'color']))
+            return self._events
+
+
+def bill_signatures(rows):
+    '''
+    Returns a signature of each bill's rows in a table with a bill_number column (e.g. the
+    history table): the sum of the rows' hashes, indexed by bill number. A bill's signature
+    changes when any of its rows are added, removed or changed.
+    '''
+    hashes = pd.util.hash_pandas_object(rows, index=False)
+    return hashes.groupby(rows['bill_number'].astype(object).to_numpy(), sort=False).sum()
+
+
+def _changed(old, new):
+    # bill numbers whose signature differs (or that are only in one of them)
+    numbers = old.index.union(new.index)
+    old, new = old.reindex(numbers), new.reindex(numbers)
+    return numbers[(old != new).to_numpy() | old.isna().to_numpy() | new.isna().to_numpy()]
+
+
+# One per calendar version (the deadlines come from it), shared across sessions. It's brought
+# up to date with the bill data by load_bill_deadlines() rather than rebuilt.
+@st.cache_resource(max_entries=2)
+def _load_bill_deadlines(calendar_version):
+    return BillDeadlines(deadlines_from_calendar(load_calendar_data()))
+
+
+def load_bill_deadlines():
+    '''
+    Returns the BillDeadlines for all bills, updated for any bills whose history or status has
+    changed since it was last used.
+    '''
+    deadlines = _load_bill_deadlines(calendar_data_version())
+    deadlines.sync(load_bill_history(), load_bills(), load_data_version())
+    return deadlines
+
+
+def get_bill_events_between(start, end, numbers=None):
+    '''
+    Returns the bill hearing and deadline events overlapping the range from start up to (not
+    including) end, for the given bill numbers (or every bill).
+    '''
+    events = load_bill_deadlines().events().between(start, end)
+    if numbers is None:
+        return events
+    return [event for event in events if event['bill_number'] in numbers]
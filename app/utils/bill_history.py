@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bill History
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Parses the history_trace column of bill_history.csv for a whole column at once. Each
+history_trace is the string form of a Python set of entries like '2024-02-12 >> Introduced.'.
+Rather than running ast.literal_eval, a regex match per entry and string concatenation on
+every row (the old ensure_set and format_bill_history, now only kept in
+benchmarks/bench_history.py for comparison), entries are pulled out of each row with one
+precompiled pattern (still a Python findall per row), and dates and actions are then split
+with vectorized string operations over all entries at once.
+
+History is stored as a long-format table (one row per entry: bill_id, bill_number, date,
+chamber, action), sorted chronologically within each bill. Markdown is only rendered for the
+bill that's being displayed.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+# A quoted entry that starts with a date, in either quote style. Escaped characters inside
+# the quotes are allowed (e.g. \' in an entry that contains both kinds of quotes).
+ENTRY_RE = re.compile(r'''
+    '(\d{4}-\d{2}-\d{2}[^'\\]*(?:\\.[^'\\]*)*)'
+    | "(\d{4}-\d{2}-\d{2}[^"\\]*(?:\\.[^"\\]*)*)"
+''', re.VERBOSE)
+
+# Actions that mark a bill moving to the other house (e.g. 'In Senate. Read first time.')
+CHAMBER_RE = r'^In (Assembly|Senate)\b'
+
+# Separator between entries in the Markdown rendering (two spaces after \n forces a newline in Markdown)
+MARKDOWN_SEP = '\n\n  '
+
+###############################################################################
+
+def find_entries(history):
+    '''
+    Pulls the history entries out of each history_trace string in a column. Returns a list
+    with one list of entries per row, in the order they appear in the string.
+    '''
+    traces = history.fillna('').astype(str).tolist()
+    entries = [[single or double for single, double in ENTRY_RE.findall(trace)] for trace in traces]
+    # undo the escaping from the set's string representation (rare, so only when needed)
+    return [[re.sub(r'''\\(['"\\])''', r'\1', e) if '\\' in e else e for e in row] for row in entries]
+
+
+def parse_history(history):
+    '''
+    Parses a column of history_trace strings into a long dataframe with one row per history
+    entry, indexed by the row label of history (so a bill's entries share its label).
+    Columns: entry (the raw entry text), date (datetime) and action.
+    '''
+    rows = find_entries(history)
+    entries = pd.Series(
+        [entry for row in rows for entry in row],
+        index=history.index.repeat([len(row) for row in rows]),
+        dtype=str,
+    )
+    # entries always start with a YYYY-MM-DD date, followed by ' >> ' and the action
+    return pd.DataFrame({
+        'entry': entries,
+        'date': pd.to_datetime(entries.str.slice(0, 10), format='%Y-%m-%d', errors='coerce'),
+        'action': entries.str.slice(10).str.replace(r'^\s*>>', '', regex=True).str.replace('>>', ':', regex=False).str.strip(),
+    })
+
+
+def build_history_table(bills):
+    '''
+    Builds the long-format history table from the merged bill data (bill_id, bill_no, chamber
+    and the raw history_trace strings in bill_history). Returns one row per history entry
+    with bill_id, bill_number, date, chamber and action, with bills in the same order as
+    bills and entries sorted chronologically within each bill.
+
+    The chamber of each action starts as the bill's house of origin and switches whenever
+    an action marks the bill moving to the other house ('In Senate. ...').
+    '''
+    parsed = parse_history(bills['bill_history'].reset_index(drop=True))
+    rows = parsed.index.to_numpy()
+    table = pd.DataFrame({
+        'row': rows,
+        'bill_id': bills['bill_id'].to_numpy()[rows],
+        'bill_number': bills['bill_no'].to_numpy()[rows],
+        'date': parsed['date'].to_numpy(),
+        'action': parsed['action'].to_numpy(),
+    })
+    # sort chronologically within each bill, keeping the bills in their original order
+    table = table.sort_values(['row', 'date'], kind='stable').reset_index(drop=True)
+
+    # carry the current house forward from each 'In Assembly'/'In Senate' action
+    origin = np.asarray(bills['chamber'], dtype=object)[table['row'].to_numpy()]
+    moves = table['action'].str.extract(CHAMBER_RE, expand=False)
+    chamber = moves.groupby(table['row']).ffill().fillna(pd.Series(origin, index=table.index))
+    table.insert(table.columns.get_loc('action'), 'chamber', chamber.astype('category'))
+    return table.drop('row', axis=1)
+
+
+def render_history(history):
+    '''
+    Renders one bill's rows of the history table as Markdown, in chronological order:
+    'date : action' entries separated by blank lines (the format the bill pages have always shown).
+    '''
+    lines = history['date'].dt.strftime('%Y-%m-%d').fillna('') + ' : ' + history['action']
+    return MARKDOWN_SEP.join(lines).strip()
+
+
+def render_histories(history):
+    '''
+    Renders the history of every bill in rows of the history table as Markdown, like
+    render_history(), with all the rows formatted at once. Returns a series of Markdown indexed
+    by bill number.
+    '''
+    lines = history['date'].dt.strftime('%Y-%m-%d').fillna('') + ' : ' + history['action']
+    return lines.groupby(history['bill_number'].to_numpy(), sort=False).agg(MARKDOWN_SEP.join).str.strip()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Bill Store
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Builds a pre-joined, pre-typed columnar store (Arrow IPC / Feather) out of the raw
+bills.csv and bill_history.csv files, so the app doesn't have to parse and merge the CSVs
+every time a page loads. Bill history goes into its own long-format table (one row per
+history entry, see utils/bill_history.py) next to the bill data, and bill text goes into a
+SQLite database keyed by bill number so it's only read for the bill being viewed. The store
+is read back with memory mapping, so a cold start only has to map the files instead of
+re-reading and re-parsing everything.
+
+The store is rebuilt automatically if it's missing or older than the CSVs. Rebuilds take a
+lock file in the data folder, so sessions (or server processes) starting at the same time
+don't build it twice, and every file is written under a temporary name and renamed into
+place, so readers never see a half-written file. It can also be built ahead of time (e.g. as part of a deploy) by running this from the app folder:
+
+    $ python -m utils.bill_store
+"""
+
+import os
+import fcntl
+import sqlite3
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+import pyarrow.feather as feather
+from utils.bill_history import build_history_table
+from utils.topics import TOPICS_FILE, load_taxonomy, build_topic_index
+
+PATH = '/Users/danyasherbini/Documents/GitHub/lt-streamlit'
+DATA_DIR = os.path.join(PATH, 'data')
+
+# Source files (in DATA_DIR)
+BILLS_CSV = 'bills.csv'
+HISTORY_CSV = 'bill_history.csv'
+TOPICS_CSV = TOPICS_FILE # topic taxonomy (see utils/topics.py)
+
+# Store files (in DATA_DIR)
+STORE_FILE = 'bills.arrow'
+HISTORY_STORE_FILE = 'bill_history.arrow'
+TEXT_STORE_FILE = 'bill_text.sqlite'
+
+# Lock file (in DATA_DIR) held while the store is being built
+LOCK_FILE = 'bills.lock'
+
+# Low-cardinality columns that are stored as categoricals
+CATEGORICAL_COLS = ['chamber', 'status']
+
+# Prefix for the boolean topic columns (one per topic in the taxonomy)
+TOPIC_PREFIX = 'topic: '
+
+###############################################################################
+
+def natural_sort(df, col='bill_no'):
+    '''
+    Sorts a dataframe by bill number in natural order, i.e. by prefix and then by the
+    numeric part (AB 2 comes before AB 10), rather than alphabetically.
+    '''
+    numbers = df[col].astype(str)
+    keys = pd.DataFrame({
+        'prefix': numbers.str.replace(r'\d.*$', '', regex=True).str.strip().to_numpy(),
+        'number': pd.to_numeric(numbers.str.extract(r'(\d+)', expand=False), errors='coerce').to_numpy(),
+    })
+    order = keys.sort_values(['prefix', 'number'], kind='stable').index.to_numpy()
+    return df.take(order)
+
+
+def build_bill_store(data_dir=DATA_DIR):
+    '''
+    Reads the raw bill CSVs, merges them, tags topics and writes the result, sorted by bill
+    number, to the columnar bill store. Bill history is parsed into the history table and
+    bill text goes into the text store, each in its own file. Returns the merged bill
+    dataframe (without history or text).
+    '''
+    # load bill data
+    bills = pd.read_csv(os.path.join(data_dir, BILLS_CSV))
+    # Change chamber id to senate and assembly
+    bills['chamber'] = np.where(bills['origin_chamber_id']==1,'Assembly','Senate')
+    # load bill history data
+    bill_history = pd.read_csv(os.path.join(data_dir, HISTORY_CSV))
+    # merge data sets
+    bills = pd.merge(bills, bill_history, how='left', on='bill_id')
+    # rename columns
+    bills = bills.rename(columns={'history_trace':'bill_history','bill_date':'date_introduced','bill_number':'bill_no'})
+    # store low-cardinality columns as categoricals
+    for col in CATEGORICAL_COLS:
+        bills[col] = bills[col].astype('category')
+    # sort by bill number, so loaders get the bills in display order
+    bills = natural_sort(bills).reset_index(drop=True)
+    # tag topics (see utils/topics.py) and store them as boolean columns
+    topic_index = build_topic_index(bills, load_taxonomy(os.path.join(data_dir, TOPICS_CSV)))
+    bills = bills.join(topic_index.add_prefix(TOPIC_PREFIX))
+    # parse bill history into the long-format history table (see utils/bill_history.py)
+    history = build_history_table(bills)
+    # move bill text to the text store, so the bill data doesn't carry it around
+    write_text_store(bills, os.path.join(data_dir, TEXT_STORE_FILE))
+    bills = bills.drop(['bill_history', 'full_text'], axis=1)
+
+    write_store(history, os.path.join(data_dir, HISTORY_STORE_FILE))
+    write_store(bills, os.path.join(data_dir, STORE_FILE))
+    return bills
+
+
+def write_store(df, path):
+    '''
+    Writes a dataframe to a store file. Written uncompressed so the file can be memory-mapped
+    when it's read back, and under a temporary name that's then swapped in, so readers never
+    see a half-written file (readers that already have the old file mapped keep it).
+    '''
+    tmp_path = path + '.tmp'
+    feather.write_feather(df, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+
+def write_text_store(bills, path):
+    '''
+    Writes bill text to a SQLite database keyed by bill number, so the text for one bill can
+    be looked up when it's needed instead of being loaded with the rest of the bill data.
+    '''
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    with sqlite3.connect(tmp_path) as conn:
+        conn.execute('CREATE TABLE bill_text (bill_number TEXT PRIMARY KEY, full_text TEXT)')
+        conn.executemany(
+            'INSERT OR REPLACE INTO bill_text VALUES (?, ?)',
+            zip(bills['bill_no'].astype(str), bills['full_text'].astype(object).where(bills['full_text'].notna(), None)),
+        )
+    conn.close()
+    # swap in the new database in one step, so readers never see a half-written file
+    os.replace(tmp_path, path)
+
+
+def is_store_stale(data_dir=DATA_DIR):
+    '''
+    Returns True if any of the store files doesn't exist or is older than any of the source
+    files. Source files that don't exist (e.g. a deploy that only ships the store) are ignored.
+    '''
+    store_paths = [os.path.join(data_dir, file) for file in (STORE_FILE, HISTORY_STORE_FILE, TEXT_STORE_FILE)]
+    sources = [os.path.join(data_dir, file) for file in (BILLS_CSV, HISTORY_CSV, TOPICS_CSV)]
+    if not all(os.path.exists(path) for path in store_paths):
+        return True
+    store_mtime = min(os.path.getmtime(path) for path in store_paths)
+    return any(os.path.getmtime(src) > store_mtime for src in sources if os.path.exists(src))
+
+
+def store_version(data_dir=DATA_DIR):
+    '''
+    Returns a version identifier for the bill store: the modification time of its newest
+    file. Changes whenever the store is rebuilt, so it can be used in cache keys for anything
+    derived from the bill data.
+    '''
+    store_paths = [os.path.join(data_dir, file) for file in (STORE_FILE, HISTORY_STORE_FILE, TEXT_STORE_FILE)]
+    return max(os.path.getmtime(path) for path in store_paths if os.path.exists(path))
+
+
+def read_store(path):
+    '''
+    Reads a store file into a dataframe, memory-mapping the file.
+    '''
+    table = feather.read_table(path, memory_map=True)
+    return table.to_pandas(split_blocks=True)
+
+
+@contextmanager
+def store_lock(data_dir=DATA_DIR):
+    '''
+    Holds the store's lock file while the block runs. Other threads and processes taking the
+    lock wait until it's released.
+    '''
+    with open(os.path.join(data_dir, LOCK_FILE), 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def ensure_store(data_dir=DATA_DIR):
+    '''
+    Builds the bill store if it's missing or out of date. Only one caller builds it: the rest
+    wait for the lock and then find the store up to date.
+    '''
+    if not is_store_stale(data_dir):
+        return
+    with store_lock(data_dir):
+        # check again, in case the store was built while waiting for the lock
+        if is_store_stale(data_dir):
+            build_bill_store(data_dir)
+
+
+def load_bill_store(data_dir=DATA_DIR):
+    '''
+    Loads the merged bill data from the bill store, building the store first if needed.
+    '''
+    ensure_store(data_dir)
+    return read_store(os.path.join(data_dir, STORE_FILE))
+
+
+def load_history_store(data_dir=DATA_DIR):
+    '''
+    Loads the bill history table from the bill store, building the store first if needed.
+    '''
+    ensure_store(data_dir)
+    return read_store(os.path.join(data_dir, HISTORY_STORE_FILE))
+
+
+def connect_text_store(data_dir=DATA_DIR):
+    '''
+    Opens a read-only connection to the bill text store, building the store first if needed.
+    The connection can be shared between threads (it's only used for reads).
+    '''
+    ensure_store(data_dir)
+    path = os.path.join(data_dir, TEXT_STORE_FILE)
+    return sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+
+
+###############################################################################
+
+if __name__ == '__main__':
+    with store_lock():
+        bills = build_bill_store()
+    print(f'Wrote {len(bills)} bills to the bill store in {DATA_DIR}')
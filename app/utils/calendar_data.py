@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Calendar Data
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Shared data for the calendar pages. The legislative calendar CSV is read and converted to
+FullCalendar events once, and the events are cached by the version of the CSV, so page reruns
+don't rebuild them and editing the CSV is picked up without restarting the app.
+
+Events are kept in an EventStore, which is sorted by start date so the events for a date range
+(e.g. the month shown on the calendar) can be found with a binary search instead of a scan, and
+the calendar only has to be sent the events it's showing.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PATH = '/Users/danyasherbini/Documents/GitHub/lt-streamlit'
+CALENDAR_CSV = os.path.join(PATH, 'data', 'assembly_dates.csv')
+
+# Columns of an event (see https://fullcalendar.io/docs/event-parsing)
+EVENT_COLS = ['title', 'start', 'end', 'allDay']
+
+###############################################################################
+
+def calendar_data_version(path=CALENDAR_CSV):
+    '''
+    Returns a version identifier for the calendar data: the modification time of the CSV.
+    '''
+    return os.path.getmtime(path)
+
+
+def events_from_frame(df, extra_cols=()):
+    '''
+    Converts a dataframe of calendar dates (title, start, end, allDay) to a list of
+    FullCalendar event dictionaries, with the whole frame converted at once rather than row
+    by row. Missing values become None (null in JSON). extra_cols are passed along too
+    (FullCalendar keeps unknown keys in the event's extendedProps).
+    '''
+    events = df[EVENT_COLS + list(extra_cols)].assign(allDay=df['allDay'].fillna(False).astype(bool))
+    return events.astype(object).where(events.notna(), None).to_dict('records')
+
+
+class EventStore:
+    '''
+    Calendar events sorted by start date, for looking up the events in a date range. Events
+    without an end date last one day (like all-day events in FullCalendar).
+    '''
+
+    def __init__(self, events):
+        starts = pd.to_datetime(pd.Series([event['start'] for event in events], dtype=object))
+        ends = pd.to_datetime(pd.Series([event['end'] for event in events], dtype=object))
+        ends = ends.fillna(starts + pd.Timedelta(days=1))
+        order = np.argsort(starts.to_numpy(), kind='stable')
+        self.starts = starts.to_numpy()[order]
+        self.ends = ends.to_numpy()[order]
+        self.events = [events[i] for i in order]
+        # the longest event, so a search by start date can't miss an event that started before
+        # the range and is still going
+        self.max_length = (self.ends - self.starts).max() if len(events) else np.timedelta64(0, 'D')
+
+    def __len__(self):
+        return len(self.events)
+
+    def between(self, start, end):
+        '''
+        Returns the events that overlap the range from start up to (not including) end, in
+        start date order.
+        '''
+        start = np.datetime64(pd.Timestamp(start))
+        end = np.datetime64(pd.Timestamp(end))
+        # events starting before end, and late enough that they could still be going at start
+        first = np.searchsorted(self.starts, start - self.max_length, side='left')
+        last = np.searchsorted(self.starts, end, side='left')
+        overlapping = first + np.flatnonzero(self.ends[first:last] > start)
+        return [self.events[i] for i in overlapping]
+
+
+def month_grid(date):
+    '''
+    Returns the range of dates a month view of the calendar shows for a date: six weeks,
+    starting on the Sunday on or before the first of the month.
+    '''
+    first = pd.Timestamp(date).normalize().replace(day=1)
+    start = first - pd.Timedelta(days=(first.dayofweek + 1) % 7)
+    return start, start + pd.Timedelta(weeks=6)
+
+
+# Cached on the data version, so a new version of the CSV gets loaded on the next rerun.
+# Shared (read-only) across sessions like the bill data.
+@st.cache_resource(max_entries=2)
+def _load_calendar(version):
+    data = pd.read_csv(CALENDAR_CSV)
+    events = events_from_frame(data)
+    return data, events, EventStore(events)
+
+
+def load_calendar_data():
+    '''
+    Returns the calendar dates as a dataframe (title, start, end, allDay).
+    '''
+    return _load_calendar(calendar_data_version())[0]
+
+
+def load_calendar_events():
+    '''
+    Returns the calendar dates as a list of FullCalendar event dictionaries.
+    '''
+    return _load_calendar(calendar_data_version())[1]
+
+
+def load_event_store():
+    '''
+    Returns the calendar events in an EventStore, for looking up the events in a date range.
+    '''
+    return _load_calendar(calendar_data_version())[2]
+
+
+def get_events_between(start, end):
+    '''
+    Returns the calendar events overlapping the range from start up to (not including) end.
+    '''
+    return load_event_store().between(start, end)
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Dashboard Store
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Saves each user's dashboard in a SQLite database, so saved bills don't disappear when the page
+is refreshed or the app restarts. Only bill numbers are saved; the bill data itself comes from
+the bill store (see utils/bill_data.py) when the dashboard is shown. The table is keyed by
+(user, bill number), so adding, removing and checking for a bill are single index lookups, and
+loading a dashboard is one query over the user's rows.
+
+The database is opened in WAL mode, so sessions reading their dashboards don't block (and
+aren't blocked by) sessions saving theirs.
+
+Dashboards are saved under the logged-in user's email when the app has authentication set up.
+Otherwise each browser gets its own dashboard: a random ID is generated on the first visit and
+kept in a cookie, so the dashboard survives refreshes and restarts without being shared with
+anyone else.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import uuid
+import streamlit as st
+from utils.bill_store import DATA_DIR
+
+# Database file (in DATA_DIR)
+DASHBOARD_FILE = 'dashboard.sqlite'
+
+# Cookie that keeps a browser's dashboard ID when nobody is logged in, and how long it lasts
+BROWSER_COOKIE = 'lt_dashboard_id'
+BROWSER_COOKIE_MAX_AGE = 365 * 24 * 60 * 60 # one year, in seconds
+
+###############################################################################
+
+class DashboardStore:
+    '''
+    Each user's saved bills (bill numbers), in the order they were added. One store (and one
+    connection) is shared by all sessions; sessions run in separate threads, so access to the
+    connection goes through a lock.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                '''
+                CREATE TABLE IF NOT EXISTS dashboard_bills (
+                    user TEXT NOT NULL,
+                    bill_number TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    PRIMARY KEY (user, bill_number)
+                ) WITHOUT ROWID
+                '''
+            )
+            # for loading a dashboard in order (and finding the next position) without a sort
+            self._conn.execute('CREATE INDEX IF NOT EXISTS dashboard_bills_order ON dashboard_bills (user, position)')
+
+    def _next_position(self, user):
+        row = self._conn.execute('SELECT MAX(position) FROM dashboard_bills WHERE user = ?', (user,)).fetchone()
+        return (row[0] or 0) + 1
+
+    def get_bills(self, user):
+        '''
+        Returns the bill numbers on a user's dashboard, in the order they were added.
+        '''
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT bill_number FROM dashboard_bills WHERE user = ? ORDER BY position', (user,)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def contains(self, user, number):
+        '''
+        Returns True if a bill is on a user's dashboard.
+        '''
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT 1 FROM dashboard_bills WHERE user = ? AND bill_number = ?', (user, str(number))
+            ).fetchone()
+        return row is not None
+
+    def add(self, user, number):
+        '''
+        Adds a bill to the end of a user's dashboard. Returns False if it was already there.
+        '''
+        return bool(self.add_many(user, [number]))
+
+    def add_many(self, user, numbers):
+        '''
+        Adds bills to the end of a user's dashboard (in the given order) in one transaction,
+        skipping any that are already there. Returns the bill numbers that were added.
+        '''
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                start = self._next_position(user)
+                added = []
+                # INSERT OR IGNORE skips bills already saved, so the check and the insert are
+                # one statement and can't race with another session adding the same bill
+                for number in dict.fromkeys(str(number) for number in numbers):
+                    cursor = self._conn.execute(
+                        'INSERT OR IGNORE INTO dashboard_bills VALUES (?, ?, ?)',
+                        (user, number, start + len(added)),
+                    )
+                    if cursor.rowcount > 0:
+                        added.append(number)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+        return added
+
+    def remove(self, user, number):
+        '''
+        Removes a bill from a user's dashboard. Returns False if it wasn't there.
+        '''
+        with self._lock:
+            cursor = self._conn.execute(
+                'DELETE FROM dashboard_bills WHERE user = ? AND bill_number = ?', (user, str(number))
+            )
+        return cursor.rowcount > 0
+
+    def move(self, user, number, last=True):
+        '''
+        Moves a bill to the end (last=True) or the start (last=False) of a user's dashboard.
+        Returns False if it isn't on the dashboard.
+        '''
+        # the new position is worked out in the same statement, so a bill added or moved by
+        # another session in between can't end up in the same place
+        end = 'MAX(position) + 1' if last else 'MIN(position) - 1'
+        with self._lock:
+            cursor = self._conn.execute(
+                f'''
+                UPDATE dashboard_bills
+                SET position = (SELECT {end} FROM dashboard_bills WHERE user = ?)
+                WHERE user = ? AND bill_number = ?
+                ''',
+                (user, user, str(number)),
+            )
+        return cursor.rowcount > 0
+
+    def clear(self, user):
+        '''
+        Removes every bill from a user's dashboard.
+        '''
+        with self._lock:
+            self._conn.execute('DELETE FROM dashboard_bills WHERE user = ?', (user,))
+
+
+@st.cache_resource
+def load_dashboard_store():
+    '''
+    Returns the dashboard store shared by all sessions in this server process.
+    '''
+    return DashboardStore(os.path.join(DATA_DIR, DASHBOARD_FILE))
+
+
+def browser_id():
+    '''
+    Returns the ID of the current browser, from its cookie. On a browser's first visit (no
+    cookie, or one that isn't an ID this app made) a new random ID is generated and the cookie
+    is set. The ID is kept in session state, so it's only looked up once per session.
+    '''
+    if 'browser_id' not in st.session_state:
+        cookie = st.context.cookies.get(BROWSER_COOKIE)
+        if isinstance(cookie, str) and re.fullmatch(r'[0-9a-f]{32}', cookie):
+            st.session_state.browser_id = cookie
+        else:
+            st.session_state.browser_id = uuid.uuid4().hex
+            # Streamlit can read cookies but not set them, so set it from the browser
+            st.html(
+                f"<script>document.cookie = '{BROWSER_COOKIE}={st.session_state.browser_id}; "
+                f"max-age={BROWSER_COOKIE_MAX_AGE}; path=/; SameSite=Lax';</script>",
+                unsafe_allow_javascript=True,
+            )
+    return st.session_state.browser_id
+
+
+def current_user():
+    '''
+    Returns the name dashboards are saved under for the current session: the logged-in
+    user's email if the app has authentication set up and the user is logged in, otherwise
+    an ID for the browser (see browser_id()), so visitors who aren't logged in don't share
+    a dashboard.
+    '''
+    if st.user.get('is_logged_in') and st.user.get('email'):
+        return st.user.get('email')
+    return f'browser:{browser_id()}'
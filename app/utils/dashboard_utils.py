@@ -4,34 +4,93 @@
 Created on Mon Jan  6 17:16:13 2025
 
 @author: danyasherbini
+
+Functions for changing the user's dashboard. The saved dashboard (see utils/dashboard_store.py)
+is the source of truth: every change is made there, in one SQL statement or transaction that
+also checks whether the bill is already on (or still on) the dashboard, so two tabs or sessions
+changing the same dashboard can't add a bill twice or lose a change. Session state only caches
+it, as an OrderedDict of bill number -> None (see utils/session_manager.py). The cache is
+updated in place from what the store reports it changed, so keeping it in sync is constant
+time per bill; it's only re-read from the store when the two turn out to disagree (e.g. the
+dashboard was changed in another tab).
 """
 
 import streamlit as st
-from utils.session_manager import update_session_state
-
-def add_bill_to_dashboard(number, name, author, coauthors, status, date, chamber, link, text, history):
-    """
-    Adds the selected bill to the dashboard and updates the session state and cache.
-    """
-    # Check if the bill is already in the selected_bills list
-    if not any(bill['bill_number'] == number for bill in st.session_state.selected_bills):
-        bill = {
-            'bill_number': number,
-            'bill_name': name,
-            'author': author,
-            'coauthors': coauthors,
-            'status': status,
-            'date_introduced': date,
-            'chamber': chamber,
-            'leginfo_link': link,
-            'full_text': text,
-            'bill_history': history
-        }
-        
-        # Add the bill to the session state
-        st.session_state.selected_bills.append(bill)
-        update_session_state(st.session_state.selected_bills)  # Update session and cache
+from utils.dashboard_store import load_dashboard_store, current_user
+from utils.session_manager import refresh_session_state
+
+def add_bills_to_dashboard(numbers):
+    """
+    Adds bills to the end of the dashboard, in the given order, in one transaction on the saved
+    dashboard. Bills already on the dashboard are skipped. Returns the bill numbers that were
+    added.
+    """
+    added = load_dashboard_store().add_many(current_user(), numbers)
+    dashboard = st.session_state.selected_bills
+    new_bills = set(added)
+    if any(number not in dashboard and number not in new_bills for number in numbers):
+        # a bill the cache doesn't have was already saved (e.g. from another tab)
+        refresh_session_state()
+    else:
+        dashboard.update(dict.fromkeys(added))
+    return added
+
+def add_to_dashboard_buttons(selected, filtered, key):
+    """
+    Buttons under a bill grid to add the selected bills, or all the bills that pass the grid's
+    filters, to the dashboard in one go (one update, however many bills there are).
+    selected and filtered are lists of bill numbers.
+    """
+    col1, col2 = st.columns(2)
+    with col1:
+        add_selected = st.button(f'Add {len(selected)} Selected to Dashboard', key=f'{key}_add_selected',
+                                 disabled=not selected, use_container_width=True)
+    with col2:
+        add_filtered = st.button(f'Add All {len(filtered)} Filtered to Dashboard', key=f'{key}_add_filtered',
+                                 disabled=not len(filtered), use_container_width=True)
+    if add_selected or add_filtered:
+        numbers = selected if add_selected else filtered
+        added = add_bills_to_dashboard(numbers)
+        st.success(f'Added {len(added)} bills to dashboard'
+                   + (f' ({len(numbers) - len(added)} already there).' if len(added) < len(numbers) else '.'))
+
+def add_bill_to_dashboard(number):
+    """
+    Adds a selected bill from the bills page to the dashboard page via the 'Add to Dashboad' button.
+    Only the bill number is kept (in the saved dashboard and in session state); the dashboard
+    looks the bill up in the shared bill data when it's shown.
+    """
+    if add_bills_to_dashboard([number]):
         st.success(f'Bill {number} added to dashboard!')
     else:
         st.warning(f'Bill {number} is already in the dashboard.')
 
+def remove_bill_from_dashboard(number):
+    """
+    Removes a bill from the dashboard. Returns False if it wasn't on the dashboard.
+    """
+    removed = load_dashboard_store().remove(current_user(), number)
+    if (st.session_state.selected_bills.pop(number, False) is None) != removed:
+        # the cache and the store disagreed about whether the bill was there
+        refresh_session_state()
+    return removed
+
+def move_bill_on_dashboard(number, to_top=False):
+    """
+    Moves a bill to the top or bottom of the dashboard. Returns False if it isn't on the
+    dashboard.
+    """
+    moved = load_dashboard_store().move(current_user(), number, last=not to_top)
+    dashboard = st.session_state.selected_bills
+    if moved and number in dashboard:
+        dashboard.move_to_end(number, last=not to_top)
+    elif moved or number in dashboard:
+        refresh_session_state()
+    return moved
+
+def clear_dashboard():
+    """
+    Removes every bill from the dashboard.
+    """
+    load_dashboard_store().clear(current_user())
+    st.session_state.selected_bills.clear()
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Exports
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Download buttons that only build the export file when the button is pressed. Passing bytes
+from to_csv() to st.download_button means every rerun writes the whole file whether or not
+anyone downloads it; here the file is generated on click and kept in an export cache shared
+by all sessions, so when many users download the same data (e.g. the same category
+selection) it's only generated once.
+
+Exports can be CSV, Parquet or Excel (xlsx), picked next to the download button. Streamlit
+needs the whole file as bytes to serve a download, so the file is built in memory; it's
+written a chunk of rows at a time, so only one chunk is converted (e.g. to CSV text) at once,
+and the buffer is handed over with BytesIO.getvalue(), which doesn't copy it.
+"""
+
+from collections import OrderedDict
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from io import BytesIO
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+# Number of rows written to the export file at a time
+CHUNK_ROWS = 5000
+
+# Export formats: format -> mime type
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+
+# Names of the export formats, for the format picker and button labels
+FORMAT_NAMES = {
+    'csv': 'CSV',
+    'parquet': 'Parquet',
+    'xlsx': 'Excel',
+}
+
+# Size limits for the export cache: exports are kept in memory up to EXPORT_CACHE_MEMORY_BYTES,
+# and the least recently used ones move to disk, up to EXPORT_CACHE_DISK_BYTES
+EXPORT_CACHE_MEMORY_BYTES = 64 * 1024 * 1024
+EXPORT_CACHE_DISK_BYTES = 512 * 1024 * 1024
+
+###############################################################################
+
+def frame_digest(df):
+    '''
+    Returns a content hash of a dataframe (values and column names), used as the cache key
+    for its exports.
+    '''
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    digest.update(repr(list(df.columns)).encode())
+    return digest.hexdigest()
+
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    '''
+    Yields a dataframe in chunks of rows.
+    '''
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df, file, chunk_rows=CHUNK_ROWS):
+    '''
+    Writes a dataframe to a CSV file in chunks of rows, so only one chunk is converted to
+    text at a time. file is a binary file.
+    '''
+    # write the header on its own, so an empty dataframe still gets one
+    df.iloc[:0].to_csv(file, index=False, encoding='utf-8')
+    for chunk in iter_chunks(df, chunk_rows):
+        chunk.to_csv(file, index=False, header=False, encoding='utf-8')
+
+
+def write_parquet(df, file, chunk_rows=CHUNK_ROWS):
+    '''
+    Writes a dataframe to a Parquet file, one row group per chunk of rows.
+    '''
+    # take the schema from the whole frame, so every chunk is written with the same types
+    # (e.g. a column that happens to be empty in the first chunk)
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(file, schema) as writer:
+        for chunk in iter_chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def write_xlsx(df, file, chunk_rows=CHUNK_ROWS):
+    '''
+    Writes a dataframe to an Excel file, using openpyxl's write-only mode so rows are
+    streamed out instead of kept in memory as cell objects.
+    '''
+    # openpyxl is only needed for Excel exports
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(col) for col in df.columns])
+    for chunk in iter_chunks(df, chunk_rows):
+        # Excel cells can't hold pandas' missing values, so those become empty cells
+        values = chunk.astype(object).where(chunk.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            sheet.append(row)
+    workbook.save(file)
+
+
+WRITERS = {
+    'csv': write_csv,
+    'parquet': write_parquet,
+    'xlsx': write_xlsx,
+}
+
+
+def write_export(df, fmt='csv', chunk_rows=CHUNK_ROWS):
+    '''
+    Writes a dataframe in the given format (csv, parquet or xlsx) and returns the file's
+    contents as bytes.
+    '''
+    if fmt not in WRITERS:
+        raise ValueError(f'Unknown export format {fmt!r}, expected one of {list(WRITERS)}')
+    with BytesIO() as file:
+        WRITERS[fmt](df, file, chunk_rows)
+        # getvalue() shares the buffer instead of copying it, as long as nothing else has a view of it
+        return file.getvalue()
+
+
+class ExportCache:
+    '''
+    Size-bounded LRU cache of export files (bytes), shared between sessions. Exports are kept
+    in memory up to max_memory_bytes; when that's full the least recently used ones are
+    moved to files in disk_dir, which holds up to max_disk_bytes before the least recently
+    used files are deleted. An export found on disk moves back to memory when it's used.
+    Counts hits (from memory or disk) and misses, see stats().
+
+    Keys can be any hashable value. Download buttons run their callbacks in separate
+    threads, so all access to the cache goes through a lock.
+    '''
+
+    def __init__(self, max_memory_bytes=EXPORT_CACHE_MEMORY_BYTES, max_disk_bytes=EXPORT_CACHE_DISK_BYTES,
+                 disk_dir=None):
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        # Without a disk_dir, exports spill to a temporary directory owned by the cache, which is
+        # deleted when the cache is closed or garbage collected, or when the server exits
+        self._tmp_dir = None
+        if disk_dir is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(prefix='lt-streamlit-exports-')
+            disk_dir = self._tmp_dir.name
+        self.disk_dir = disk_dir
+        os.makedirs(self.disk_dir, exist_ok=True)
+        # key -> bytes, and key -> (file path, size), both in least to most recently used order
+        self._memory = OrderedDict()
+        self._disk = OrderedDict()
+        self.memory_bytes = 0
+        self.disk_bytes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, hashlib.sha1(repr(key).encode()).hexdigest())
+
+    def _evict(self):
+        # move the least recently used exports from memory to disk until memory fits
+        while self.memory_bytes > self.max_memory_bytes and self._memory:
+            key, data = self._memory.popitem(last=False)
+            self.memory_bytes -= len(data)
+            if len(data) <= self.max_disk_bytes:
+                path = self._disk_path(key)
+                with open(path, 'wb') as file:
+                    file.write(data)
+                self._disk[key] = (path, len(data))
+                self.disk_bytes += len(data)
+        # then delete the least recently used files until the disk cache fits
+        while self.disk_bytes > self.max_disk_bytes and self._disk:
+            key, (path, size) = self._disk.popitem(last=False)
+            self.disk_bytes -= size
+            os.remove(path)
+
+    def get(self, key):
+        '''
+        Returns the cached export for a key, or None if it isn't cached.
+        '''
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+            if key in self._disk:
+                path, size = self._disk.pop(key)
+                self.disk_bytes -= size
+                with open(path, 'rb') as file:
+                    data = file.read()
+                os.remove(path)
+                # back to memory, as the most recently used export
+                self._memory[key] = data
+                self.memory_bytes += size
+                self._evict()
+                self.hits += 1
+                self.disk_hits += 1
+                return data
+            self.misses += 1
+            return None
+
+    def put(self, key, data):
+        '''
+        Adds an export to the cache (replacing any export already cached for the key).
+        '''
+        with self._lock:
+            if key in self._memory:
+                self.memory_bytes -= len(self._memory.pop(key))
+            if key in self._disk:
+                path, size = self._disk.pop(key)
+                self.disk_bytes -= size
+                os.remove(path)
+            self._memory[key] = data
+            self.memory_bytes += len(data)
+            self._evict()
+
+    def get_or_create(self, key, create):
+        '''
+        Returns the cached export for a key, calling create() to generate (and cache) it if
+        it isn't cached.
+        '''
+        data = self.get(key)
+        if data is None:
+            # generated outside the lock, so one slow export doesn't hold up the others
+            data = create()
+            self.put(key, data)
+        return data
+
+    def stats(self):
+        '''
+        Returns a dictionary of the cache's hit/miss counts, entry counts and sizes.
+        '''
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'memory_entries': len(self._memory),
+                'memory_bytes': self.memory_bytes,
+                'disk_entries': len(self._disk),
+                'disk_bytes': self.disk_bytes,
+            }
+
+    def clear(self):
+        '''
+        Removes everything from the cache (the counters are kept).
+        '''
+        with self._lock:
+            self._memory.clear()
+            self._disk.clear()
+            self.memory_bytes = 0
+            self.disk_bytes = 0
+            shutil.rmtree(self.disk_dir, ignore_errors=True)
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def close(self):
+        '''
+        Empties the cache and deletes its temporary directory (if it made one).
+        '''
+        self.clear()
+        if self._tmp_dir is not None:
+            self._tmp_dir.cleanup()
+
+
+# Closed when it's dropped from the cache (e.g. st.cache_resource.clear()), so its files go too
+@st.cache_resource(on_release=ExportCache.close)
+def load_export_cache():
+    '''
+    Returns the export cache shared by all sessions in this server process.
+    '''
+    return ExportCache()
+
+
+def export_data(df, fmt='csv', cache_key=None):
+    '''
+    Returns the export of a dataframe in the given format as bytes, from the export cache if
+    it's been exported before. cache_key identifies the data being exported, e.g. (data
+    version, selected categories, columns); df can be a function that returns the
+    dataframe, which is then only called if the export isn't cached. Without a cache_key the
+    export is cached by a hash of the dataframe's contents.
+    '''
+    if cache_key is None:
+        df = df() if callable(df) else df
+        cache_key = ('digest', frame_digest(df))
+
+    def create():
+        return write_export(df() if callable(df) else df, fmt)
+
+    return load_export_cache().get_or_create((cache_key, fmt), create)
+
+
+def export_button(df, label='Download Data', file_name='output', formats=tuple(EXPORT_FORMATS), key=None,
+                  cache_key=None, **kwargs):
+    '''
+    Download button for a dataframe that only generates the export when the button is
+    pressed. With more than one of formats (csv, parquet, xlsx), a picker for the format is
+    shown above the button; the format's name is added to the label (e.g. 'Download Data as
+    CSV') and its extension to file_name. df can also be a function that returns the
+    dataframe, to defer building it as well. cache_key identifies the data for the export
+    cache (see export_data()). Other keyword arguments are passed on to st.download_button.
+    '''
+    fmt = formats[0]
+    if len(formats) > 1:
+        fmt = st.selectbox(
+            'Export format',
+            formats,
+            format_func=FORMAT_NAMES.get,
+            key=None if key is None else f'{key}_format',
+            label_visibility='collapsed',
+        )
+
+    def data():
+        return export_data(df, fmt, cache_key)
+
+    return st.download_button(
+        label=f'{label} as {FORMAT_NAMES[fmt]}',
+        data=data,
+        file_name=f'{os.path.splitext(file_name)[0]}.{fmt}',
+        mime=EXPORT_FORMATS[fmt],
+        key=key,
+        **kwargs,
+    )
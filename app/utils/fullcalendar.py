@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+FullCalendar Component
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Streamlit component that draws a FullCalendar (https://fullcalendar.io) calendar. The
+FullCalendar files (main.min.js, main.min.css and the license) are vendored into the
+component's folder (src/fullcalendar/vendor/fullcalendar-<version>) and committed, and
+streamlit serves them with the component, so the calendar works without internet access. If
+the vendored files are missing (or don't load), the component falls back to loading them
+from the CDN, as the calendar page did before.
+
+The vendored files aren't downloaded at run time. To vendor a new version, change
+FULLCALENDAR_VERSION, run this from the app folder on a machine with internet access and
+commit the result:
+
+    $ python -m utils.fullcalendar
+"""
+
+import io
+import os
+import shutil
+import tarfile
+import urllib.request
+import streamlit.components.v1 as components
+
+# The component's folder (app/src/fullcalendar), found from this file so it works wherever the app is
+COMPONENT_DIR = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'fullcalendar'))
+
+# FullCalendar version that's vendored, and where it's downloaded from (the npm package)
+FULLCALENDAR_VERSION = '5.10.0'
+FULLCALENDAR_URL = f'https://registry.npmjs.org/fullcalendar/-/fullcalendar-{FULLCALENDAR_VERSION}.tgz'
+VENDOR_DIR = os.path.join(COMPONENT_DIR, 'vendor', f'fullcalendar-{FULLCALENDAR_VERSION}')
+VENDOR_URL = f'vendor/fullcalendar-{FULLCALENDAR_VERSION}/' # relative to the component's page
+
+# Where the component loads the files from when they haven't been vendored
+FULLCALENDAR_CDN_URL = f'https://cdn.jsdelivr.net/npm/fullcalendar@{FULLCALENDAR_VERSION}/'
+
+# Files vendored from the npm package
+VENDOR_FILES = ['main.min.js', 'main.min.css', 'LICENSE.txt']
+
+_component = components.declare_component('fullcalendar', path=COMPONENT_DIR)
+
+###############################################################################
+
+def fullcalendar(events, options=None, custom_css='', height=600, events_range=None, key=None):
+    '''
+    Draws a FullCalendar calendar. events is a list of FullCalendar event dictionaries,
+    options a dictionary of FullCalendar options (https://fullcalendar.io/docs) and
+    custom_css extra CSS for the calendar. Clicking an event shows its title.
+
+    If events only covers a date range, pass the range as events_range (a (start, end) pair of
+    dates, end not included). When the calendar is moved to dates outside the range, the page
+    reruns and this returns the dates now showing, as a dictionary with 'start' and 'end'
+    (YYYY-MM-DD strings); the value is also in st.session_state[key]. Returns None until then.
+    '''
+    # folders to load FullCalendar from, in order
+    asset_urls = [VENDOR_URL, FULLCALENDAR_CDN_URL] if assets_vendored() else [FULLCALENDAR_CDN_URL]
+    if events_range is not None:
+        start, end = events_range
+        events_range = {'start': str(start)[:10], 'end': str(end)[:10]}
+    return _component(
+        events=events,
+        events_range=events_range,
+        options=options or {},
+        custom_css=custom_css,
+        height=height,
+        version=FULLCALENDAR_VERSION,
+        asset_urls=asset_urls,
+        key=key,
+        default=None,
+    )
+
+
+def assets_vendored():
+    '''
+    Returns True if the FullCalendar files have been vendored into the component's folder.
+    '''
+    return all(os.path.exists(os.path.join(VENDOR_DIR, file)) for file in VENDOR_FILES)
+
+
+def fetch_assets(url=FULLCALENDAR_URL, vendor_dir=VENDOR_DIR):
+    '''
+    Downloads the FullCalendar npm package and copies the files the component needs into
+    the vendor folder.
+    '''
+    with urllib.request.urlopen(url) as response:
+        package = tarfile.open(fileobj=io.BytesIO(response.read()), mode='r:gz')
+    tmp_dir = vendor_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for file in VENDOR_FILES:
+        with package.extractfile(f'package/{file}') as src, open(os.path.join(tmp_dir, file), 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+    # swap in the new files in one step
+    shutil.rmtree(vendor_dir, ignore_errors=True)
+    os.replace(tmp_dir, vendor_dir)
+
+
+###############################################################################
+
+if __name__ == '__main__':
+    fetch_assets()
+    print(f'Vendored FullCalendar {FULLCALENDAR_VERSION} into {VENDOR_DIR}')
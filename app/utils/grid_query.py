@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Grid Query
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Answers grid queries (search, filter, sort and page) in Python, for the server-side mode of
+the Ag Grid tables. Instead of sending the whole dataframe to the browser and letting the
+grid filter and sort it, the grid only gets the rows for the page being viewed.
+"""
+
+from functools import lru_cache
+import numpy as np
+import streamlit as st
+from utils.exports import frame_digest
+
+###############################################################################
+
+class GridIndex:
+    '''
+    Index over a dataframe for answering grid queries. Lowercased search text and sort
+    orders are computed once per column and reused, and recent queries are memoized, so
+    paging through results doesn't redo any filtering or sorting.
+    '''
+
+    def __init__(self, df):
+        self.df = df
+        self._text = {}
+        self._orders = {}
+        self._rows = lru_cache(maxsize=32)(self._compute_rows)
+
+    def _lower_text(self, col):
+        if col not in self._text:
+            self._text[col] = self.df[col].astype(str).str.lower().reset_index(drop=True)
+        return self._text[col]
+
+    def _order(self, col, descending=False):
+        # No sort column means the frame's own order (e.g. bills are already sorted by bill number)
+        if col is None:
+            order = np.arange(len(self.df))
+            return order[::-1] if descending else order
+        # sorted separately for each direction, so missing values come last either way
+        if (col, descending) not in self._orders:
+            values = self.df[col].reset_index(drop=True)
+            self._orders[col, descending] = values.sort_values(
+                ascending=not descending, kind='stable', na_position='last'
+            ).index.to_numpy()
+        return self._orders[col, descending]
+
+    def _compute_rows(self, search, search_cols, filters, sort_by, descending):
+        mask = np.ones(len(self.df), dtype=bool)
+        # search: the text has to appear in at least one of the search columns
+        if search:
+            found = np.zeros(len(self.df), dtype=bool)
+            for col in search_cols:
+                found |= self._lower_text(col).str.contains(search.lower(), regex=False).to_numpy()
+            mask &= found
+        # filters: the text has to appear in that column
+        for col, text in filters:
+            mask &= self._lower_text(col).str.contains(text.lower(), regex=False).to_numpy()
+        order = self._order(sort_by, descending)
+        return order[mask[order]]
+
+    def match(self, search=None, search_cols=(), filters=None, sort_by=None, descending=False):
+        '''
+        Returns the positions of the rows matching a query, in sorted order. search has to
+        appear in at least one of search_cols, and filters is a dictionary of column -> text
+        that has to appear in that column (both case-insensitive).
+        '''
+        filters = tuple(sorted((filters or {}).items()))
+        return self._rows(search or None, tuple(search_cols), filters, sort_by, descending)
+
+    def query(self, search=None, search_cols=(), filters=None, sort_by=None, descending=False,
+              page=0, page_size=100):
+        '''
+        Returns one page of rows matching the query, plus the total number of matching rows.
+        Pages are numbered from 0.
+        '''
+        rows = self.match(search, search_cols, filters, sort_by, descending)
+        return self.df.take(rows[page * page_size:(page + 1) * page_size]), len(rows)
+
+
+# Keyed on what the data is (e.g. the bills at a data version), not on the frame object, so a
+# new version of the data gets a new index. Each index holds on to its frame, so only a few
+# are kept.
+@st.cache_resource(max_entries=4)
+def _load_grid_index(_df, cache_key):
+    return GridIndex(_df)
+
+
+def get_grid_index(df, cache_key=None):
+    '''
+    Returns the (cached) grid index for a dataframe, so the index is built once and reused
+    across reruns and sessions. cache_key identifies the data (e.g. ('bills',
+    load_data_version())); without one the frame's content hash is used, which costs a pass
+    over the frame.
+    '''
+    if cache_key is None:
+        cache_key = ('digest', frame_digest(df))
+    return _load_grid_index(df, cache_key)
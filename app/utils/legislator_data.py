@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Legislator Data
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Shared data for the legislators page, and the link between legislators and bills. Bills only
+name their authors and coauthors as free text (usually just a last name, e.g. 'Wiener'), so a
+legislator index is built once at load: every form a legislator's name can take (the full
+'Last, First M.' name, 'First Last', the last name on its own, ...) is mapped to their
+legislator_id.
+
+Every bill's authors and coauthors are resolved to legislator IDs once, into a long-format
+table (one row per bill and name, like the bill history table), and grouped into dictionaries.
+Looking up a legislator's bills or the parties of a bill's coauthors is then a dictionary
+lookup rather than a substring search of the bill table.
+
+The numbers in the legislator info dialog (bill counts, statuses and recent activity) are
+worked out for every legislator in one grouped pass over that table when it's loaded, so
+opening a legislator is a lookup however many bills there are.
+"""
+
+import os
+import re
+import pandas as pd
+import streamlit as st
+from utils.bill_store import DATA_DIR
+from utils.bill_data import load_bills, get_bills, load_latest_actions
+
+LEGISLATORS_CSV = os.path.join(DATA_DIR, 'legislators.csv')
+
+# chamber_id in legislators.csv
+CHAMBERS = {1: 'Assembly', 2: 'Senate'}
+
+# Roles a legislator can have on a bill (the bill columns they come from)
+AUTHOR = 'author'
+COAUTHOR = 'coauthor'
+ROLE_COLS = {AUTHOR: 'author', COAUTHOR: 'coauthors'}
+
+# A house named before a legislator's name on a bill (e.g. 'Senator Dahle'), and the chamber it
+# means
+HOUSE_RE = r'^(Senator|Assembly\s*Member)\s+(.+)$'
+HOUSES = {'senator': 'Senate', 'assembly member': 'Assembly', 'assemblymember': 'Assembly'}
+
+# Number of bills listed under recent activity in the legislator info dialog
+RECENT_ACTIVITY = 10
+
+###############################################################################
+
+def normalize_name(name):
+    '''
+    Returns a name in the form used for lookups: lower case, without periods, single spaces.
+    '''
+    return re.sub(r'\s+', ' ', name.replace('.', ' ')).strip().lower()
+
+
+def name_variants(name):
+    '''
+    Returns the normalized forms a legislator's name can take on a bill, from the
+    'Last, First M.' form in legislators.csv: the name as is, 'First M. Last', 'First Last',
+    'Last, First' and 'Last'.
+    '''
+    last, _, first = (normalize_name(part) for part in name.partition(','))
+    variants = {normalize_name(name), last}
+    if first:
+        first_name = first.split(' ')[0]
+        variants.update([f'{first} {last}', f'{first_name} {last}', f'{last}, {first_name}'])
+    return variants
+
+
+class LegislatorIndex:
+    '''
+    Looks up legislators by any form of their name. Names that more than one legislator could
+    have (e.g. a shared last name) are narrowed down by chamber when one is given.
+    '''
+
+    def __init__(self, legislators):
+        self.chambers = dict(zip(legislators['legislator_id'], legislators['chamber']))
+        self.ids = {}
+        for legislator_id, name in zip(legislators['legislator_id'], legislators['name']):
+            for variant in name_variants(name):
+                self.ids.setdefault(variant, []).append(legislator_id)
+
+    def resolve(self, name, chamber=None):
+        '''
+        Returns the legislator_id for a name (None if no legislator, or more than one, has it).
+        A chamber, if given, narrows down a name that legislators in both houses have.
+        '''
+        candidates = self.ids.get(normalize_name(name), [])
+        if len(candidates) > 1 and chamber is not None:
+            candidates = [legislator_id for legislator_id in candidates if self.chambers[legislator_id] == chamber]
+        return candidates[0] if len(candidates) == 1 else None
+
+
+@st.cache_resource
+def load_legislators():
+    '''
+    Returns the legislators (legislator_id, name, district, party, chamber). Shared and
+    read-only like the bill data.
+    '''
+    legislators = pd.read_csv(LEGISLATORS_CSV)
+    legislators['chamber'] = legislators['chamber_id'].map(CHAMBERS)
+    return legislators.drop(['chamber_id'], axis=1)
+
+
+@st.cache_resource
+def load_legislator_index():
+    '''
+    Returns the LegislatorIndex for load_legislators().
+    '''
+    return LegislatorIndex(load_legislators())
+
+
+@st.cache_resource
+def load_legislator_positions():
+    '''
+    Returns a dictionary of legislator_id -> row position in load_legislators().
+    '''
+    legislators = load_legislators()
+    return dict(zip(legislators['legislator_id'], range(len(legislators))))
+
+
+def get_legislator(legislator_id):
+    '''
+    Returns the row for one legislator as a series (None if the ID isn't found).
+    '''
+    position = load_legislator_positions().get(legislator_id)
+    return None if position is None else load_legislators().iloc[position]
+
+
+###############################################################################
+
+@st.cache_resource
+def load_bill_legislators():
+    '''
+    Returns every bill's authors and coauthors, one row per bill and name: bill_number, role
+    (AUTHOR or COAUTHOR), name as written on the bill, and the legislator_id and party it
+    resolves to (missing if it doesn't resolve). Rows are in bill order.
+    '''
+    bills = load_bills()
+    tables = []
+    for role, col in ROLE_COLS.items():
+        names = bills[['bill_number', 'chamber', col]].astype(object).rename(columns={col: 'name'})
+        names['name'] = names['name'].str.split(',')
+        names = names.explode('name', ignore_index=False)
+        names['name'] = names['name'].str.strip()
+        names = names[names['name'].notna() & (names['name'] != '')]
+        tables.append(names.assign(role=role, order=names.index))
+    table = pd.concat(tables).sort_values('order', kind='stable').drop(columns='order').reset_index(drop=True)
+
+    # Authors are from the bill's house of origin, so a name that legislators in both houses
+    # have is narrowed down by it. Coauthors can be from either house, so they're only narrowed
+    # down by a house named on the bill (e.g. 'Senator Dahle'); otherwise a shared name is left
+    # unresolved rather than guessed.
+    named = table['name'].str.extract(HOUSE_RE, flags=re.IGNORECASE, expand=True)
+    names = named[1].fillna(table['name']).astype(object)
+    chambers = table['chamber'].astype(object).where(table['role'] == AUTHOR, None)
+    chambers = named[0].str.lower().str.replace(r'\s+', ' ', regex=True).map(HOUSES).astype(object).fillna(chambers)
+    chambers = chambers.where(chambers.notna(), None)
+
+    # Each distinct (name, chamber) pair is resolved once
+    index = load_legislator_index()
+    pairs = set(zip(names, chambers))
+    resolved = {(name, chamber): index.resolve(name, chamber) for name, chamber in pairs}
+    ids = [resolved[pair] for pair in zip(names, chambers)]
+    table['legislator_id'] = pd.array(ids, dtype='Int64')
+    parties = load_legislators().set_index('legislator_id')['party']
+    table['party'] = table['legislator_id'].map(parties)
+    return table[['bill_number', 'role', 'name', 'legislator_id', 'party']]
+
+
+def _group(table, key, value):
+    # dictionary of key -> role -> list of values, over the resolved rows
+    groups = {}
+    for (key_value, role), values in table.groupby([key, 'role'], sort=False)[value]:
+        groups.setdefault(key_value, {})[role] = list(values)
+    return groups
+
+
+@st.cache_resource
+def load_legislator_bills():
+    '''
+    Returns a dictionary of legislator_id -> role -> bill numbers (in bill order).
+    '''
+    table = load_bill_legislators().dropna(subset=['legislator_id'])
+    return _group(table.astype({'legislator_id': 'int64'}), 'legislator_id', 'bill_number')
+
+
+@st.cache_resource
+def load_bill_legislator_ids():
+    '''
+    Returns a dictionary of bill number -> role -> legislator IDs (in the order on the bill).
+    Names that don't resolve to a legislator are left out.
+    '''
+    table = load_bill_legislators().dropna(subset=['legislator_id'])
+    return _group(table.astype({'legislator_id': 'int64'}), 'bill_number', 'legislator_id')
+
+
+@st.cache_resource
+def load_coauthor_parties():
+    '''
+    Returns a dictionary of bill number -> party -> number of coauthors from that party.
+    '''
+    table = load_bill_legislators()
+    coauthors = table[(table['role'] == COAUTHOR) & table['party'].notna()]
+    counts = coauthors.groupby(['bill_number', 'party'], sort=False).size()
+    parties = {}
+    for (number, party), count in counts.items():
+        parties.setdefault(number, {})[party] = int(count)
+    return parties
+
+
+def get_legislator_bills(legislator_id, role=AUTHOR):
+    '''
+    Returns the rows of load_bills() for the bills a legislator is an author (role=AUTHOR) or
+    coauthor (role=COAUTHOR) of.
+    '''
+    return get_bills(load_legislator_bills().get(legislator_id, {}).get(role, []))
+
+
+def get_bill_legislator_ids(number, role=AUTHOR):
+    '''
+    Returns the legislator IDs of a bill's authors (role=AUTHOR) or coauthors (role=COAUTHOR).
+    '''
+    return load_bill_legislator_ids().get(number, {}).get(role, [])
+
+
+def get_coauthor_parties(number):
+    '''
+    Returns the number of coauthors of a bill from each party, as a dictionary of party ->
+    count (empty if none of its coauthors resolve to a legislator).
+    '''
+    return load_coauthor_parties().get(number, {})
+
+
+###############################################################################
+
+def empty_stats():
+    '''
+    Returns the stats for a legislator with no bills (see load_legislator_stats()).
+    '''
+    return {'authored': 0, 'coauthored': 0, 'status': {}, 'recent': []}
+
+
+@st.cache_resource
+def load_legislator_stats():
+    '''
+    Returns a dictionary of legislator_id -> stats for the legislator info dialog: number of
+    bills authored and coauthored, number of authored bills in each status, and the latest
+    action on their most recently active bills (a list of dictionaries with bill_number, role,
+    date and action, newest first). Legislators without bills aren't included (see
+    empty_stats()).
+    '''
+    table = load_bill_legislators().dropna(subset=['legislator_id'])
+    bills = load_bills().set_index('bill_number')
+    latest = load_latest_actions()
+    table = table.assign(
+        legislator_id=table['legislator_id'].astype('int64'),
+        status=table['bill_number'].map(bills['status']).astype(object),
+        date=table['bill_number'].map(latest['date']),
+        action=table['bill_number'].map(latest['action']).astype(object),
+    )
+    # Newest activity first, so each legislator's recent activity is the top of their group
+    table = table.sort_values('date', ascending=False, kind='stable', na_position='last')
+
+    stats = {}
+    for legislator_id, rows in table.groupby('legislator_id', sort=False):
+        authored = rows[rows['role'] == AUTHOR]
+        recent = rows.dropna(subset=['date']).drop_duplicates('bill_number').head(RECENT_ACTIVITY)
+        stats[legislator_id] = {
+            'authored': authored['bill_number'].nunique(),
+            'coauthored': rows.loc[rows['role'] == COAUTHOR, 'bill_number'].nunique(),
+            'status': authored.drop_duplicates('bill_number')['status'].value_counts().to_dict(),
+            'recent': recent[['bill_number', 'role', 'date', 'action']].to_dict('records'),
+        }
+    return stats
+
+
+def get_legislator_stats(legislator_id):
+    '''
+    Returns the stats for one legislator (see load_legislator_stats()).
+    '''
+    return load_legislator_stats().get(legislator_id) or empty_stats()
@@ -8,25 +8,28 @@ Created on Jan 6, 2025
 Initializes session state for the app (only need to run once for the app)
 """
 
+from collections import OrderedDict
 import streamlit as st
-from utils.cache_manager import get_cached_bills, update_cached_bills
+from utils.dashboard_store import load_dashboard_store, current_user
 
 # Function to initialize session state
 def initialize_session_state():
     """
-    Initialize session state for 'selected_bills' if it doesn't exist.
-    This will run once at the start.
+    Initialize session state for 'selected_bills' from the user's saved dashboard if it doesn't
+    exist. This will run once at the start.
+    selected_bills holds bill numbers, not bill data, so it stays small no matter how big the
+    bills are. It's an OrderedDict of bill number -> None, i.e. an ordered set: the keys are
+    in display order and lookups are constant time. It's a cache of the saved dashboard (see
+    utils/dashboard_store.py), which is the source of truth; changes go to the store first and
+    are then applied to the cache (see utils/dashboard_utils.py).
     """
     if 'selected_bills' not in st.session_state:
-        st.session_state.selected_bills = get_cached_bills()  # Load from cache if available
+        refresh_session_state()
 
-# Function to update session state with new selected bills
-def update_session_state(new_bills):
+# Function to reload the dashboard from the store
+def refresh_session_state():
     """
-    Update the session state with new list of selected bills.
+    Reload 'selected_bills' from the user's saved dashboard (one indexed query over the
+    user's rows).
     """
-    st.session_state.selected_bills = new_bills
-    update_cached_bills(new_bills)  # Update the cache
-    
-    
-    
+    st.session_state.selected_bills = OrderedDict.fromkeys(load_dashboard_store().get_bills(current_user()))
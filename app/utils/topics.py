@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Topics
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Topic taxonomy for bills and the topic-tagging step. The taxonomy (topics and their search
+terms) lives in data/topics.csv. Bills are tagged against every topic at once with an
+Aho-Corasick automaton, so each bill's text is scanned a single time no matter how many
+topics or terms there are. Tagging runs when the bill store is built (see utils/bill_store.py).
+"""
+
+import os
+from collections import deque
+import pandas as pd
+
+PATH = '/Users/danyasherbini/Documents/GitHub/lt-streamlit'
+TOPICS_FILE = 'topics.csv' # in the data folder
+TOPICS_CSV = os.path.join(PATH, 'data', TOPICS_FILE)
+
+# Bill columns that are searched for topic terms
+TAG_COLS = ['bill_name', 'full_text']
+
+###############################################################################
+
+def load_taxonomy(path=TOPICS_CSV):
+    '''
+    Reads the topic taxonomy (a CSV with topic and term columns, one row per term).
+    Returns a dictionary of topic -> list of terms, in file order.
+    '''
+    taxonomy = pd.read_csv(path, dtype=str).dropna()
+    return {topic: list(terms) for topic, terms in taxonomy.groupby('topic', sort=False)['term']}
+
+
+###############################################################################
+
+class TopicMatcher:
+    '''
+    Aho-Corasick automaton over all terms of all topics. Matching is case-insensitive and
+    on substrings (like str.contains), and finds every topic present in a text in one pass.
+    '''
+
+    def __init__(self, taxonomy):
+        self.topics = list(taxonomy)
+
+        # Build the trie. Each state records which topics (as a bitmask) have a term ending there.
+        goto = [{}]
+        out = [0]
+        for bit, topic in enumerate(self.topics):
+            for term in taxonomy[topic]:
+                state = 0
+                for ch in term.lower():
+                    if ch not in goto[state]:
+                        goto.append({})
+                        out.append(0)
+                        goto[state][ch] = len(goto) - 1
+                    state = goto[state][ch]
+                out[state] |= 1 << bit
+
+        # Breadth-first pass to add failure links. Transitions are resolved ahead of time so
+        # matching never has to follow failure links; to keep that small, each state only
+        # stores the transitions that differ from the root's.
+        fail = [0] * len(goto)
+        delta = [None] * len(goto)
+        delta[0] = goto[0]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] |= out[fail[state]]
+            delta[state] = {**delta[fail[state]], **goto[state]} if fail[state] else goto[state]
+            for ch, child in goto[state].items():
+                fail[child] = self._step(delta, fail[state], ch) if state else 0
+                queue.append(child)
+
+        self._delta = delta
+        self._out = out
+
+    @staticmethod
+    def _step(delta, state, ch):
+        return delta[state].get(ch) or delta[0].get(ch, 0)
+
+    def match(self, text):
+        '''
+        Returns a bitmask of the topics found in text (bit i is set for self.topics[i]).
+        '''
+        delta, root, out = self._delta, self._delta[0], self._out
+        state = 0
+        mask = 0
+        for ch in text.lower():
+            state = delta[state].get(ch) or root.get(ch, 0)
+            mask |= out[state]
+        return mask
+
+    def tag(self, texts):
+        '''
+        Tags each text in a series. Returns a boolean dataframe with one column per topic,
+        aligned with the index of texts.
+        '''
+        masks = [self.match(text) if isinstance(text, str) else 0 for text in texts]
+        return pd.DataFrame(
+            {topic: [bool(mask >> bit & 1) for mask in masks] for bit, topic in enumerate(self.topics)},
+            index=texts.index,
+            columns=self.topics,
+        )
+
+
+def build_topic_index(bills, taxonomy=None, cols=TAG_COLS):
+    '''
+    Tags each bill with its topics, searching the given columns (bill name and full text
+    by default). Returns a boolean dataframe with one column per topic, aligned with bills.
+    '''
+    if taxonomy is None:
+        taxonomy = load_taxonomy()
+    matcher = TopicMatcher(taxonomy)
+    # Join the searched columns so each bill's text goes through the automaton once. The
+    # separator keeps a term from matching across the end of one column and the start of the next.
+    texts = bills[cols[0]].fillna('').astype(str)
+    for col in cols[1:]:
+        texts = texts + '\n' + bills[col].fillna('').astype(str)
+    return matcher.tag(texts)
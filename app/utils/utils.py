@@ -10,128 +10,41 @@ Custom functions for Legislation Tracker streamlit app
 """
 import streamlit as st
 from utils.session_manager import initialize_session_state
+from utils.dashboard_utils import add_bill_to_dashboard
+from utils.bill_data import load_bill_record, get_bill_text
+from utils.legislator_data import get_coauthor_parties, get_legislator, get_legislator_stats
 
 ###############################################################################
 
-import ast
-
-def ensure_set(x):
-    '''
-    Converts a string to a set.
-    Needed to reformat the bill history column in the bills data set.
-    '''
-    if isinstance(x, str):
-        try:
-            # Convert string representation of a set to an actual set
-            return ast.literal_eval(x)
-        except (ValueError, SyntaxError):
-            # If it's not a valid string representation, return an empty set
-            return set()
-    elif isinstance(x, set):
-        return x
-    else:
-        # Return an empty set if the type is not recognized
-        return set()
-
-
-###############################################################################
-
-import re
-
-def format_bill_history(element_set):
+@st.dialog('Bill Info', width='large')
+def display_bill_info(number):
     '''
-    Reformats Bill History into a more readable/cleaner format for Streamlit,
-    with extra empty lines between entries using Markdown formatting. Necessary 
-    because we use st.markdown() to display bill_history text on the streamlit app.
+    Displays bill information in a dialog pop-up box for a bill number, e.g. when a row is
+    selected in an Ag Grid data frame. Everything shown (apart from the bill text) comes from
+    the bill's cached record, formatted once (see load_bill_record() in utils/bill_data.py).
     '''
-    result = ''
-    current_date = None
-    
-    for element in element_set:
-        # Replace '>>' with ':' in the entire set
-        element = element.replace('>>', ':')
-        
-        # Check if the element starts with a date
-        if re.match(r'^\d{4}-\d{2}-\d{2}', element):
-            # If it's a date, start a new line with Markdown-friendly formatting
-            if current_date is not None:
-                result += "\n\n  "  # Two spaces after \n forces a newline in Markdown
-            
-            # Add the date element
-            result += element
-        
-            # Store the date for the next iteration
-            current_date = element.split()[0].split('-')[0]
-    
-    return result.strip()
+    bill = load_bill_record(number)
+    if bill is None:
+        st.warning(f'Bill {number} not found.')
+        return
 
+    # bill text is fetched from the text store for just this bill
+    text = get_bill_text(number)
 
-###############################################################################
-
-def add_bill_to_dashboard(number, name, author, coauthors, status, date, chamber, link, text, history):
-    """
-    Adds a selected bill from the bills page to the dashboard page via the 'Add to Dashboad' button.
-    """
-    # Check if the bill is already in the selected_bills list
-    if not any(bill['bill_number'] == number for bill in st.session_state.selected_bills):
-        bill = {
-            'bill_number': number,
-            'bill_name': name,
-            'author': author,
-            'coauthors': coauthors,
-            'status': status,
-            'date_introduced': date,
-            'chamber': chamber,
-            'leginfo_link': link,
-            'full_text': text,
-            'bill_history': history
-        }
-        
-        # Add the bill to the session state
-        st.session_state.selected_bills.append(bill)
-        st.success(f'Bill {number} added to dashboard!')
-    else:
-        st.warning(f'Bill {number} is already in the dashboard.')
-
-###############################################################################
-
-@st.dialog('Bill Info', width='large')
-def display_bill_info(selected_rows):
-    '''
-    Displays bill information in a dialog pop-up box when a row is selected in
-    an Ag Grid data frame.
-    '''
-    # Extract the values from the selected row
-    number = selected_rows['bill_number'].iloc[0]
-    name = selected_rows['bill_name'].iloc[0]
-    author = selected_rows['author'].iloc[0]
-    coauthors = selected_rows['coauthors'].iloc[0]
-    status = selected_rows['status'].iloc[0]
-    date = selected_rows['date_introduced'].iloc[0]
-    session = selected_rows['leg_session'].iloc[0]
-    chamber = selected_rows['chamber'].iloc[0]
-    link = selected_rows['leginfo_link'].iloc[0]
-    text = selected_rows['full_text'].iloc[0]
-    history = selected_rows['bill_history'].iloc[0]
-    
-    # Initialize 'selected_bills' if it doesn't exist
-    #if 'selected_bills' not in st.session_state:
-       #st.session_state.selected_bills = []
-      
     # Container for bill number and chamber
     with st.container(key='number_chamber'):
         # Display two columns in this container
         col1, col2 = st.columns(2)
         with col1:
             st.markdown('##### Bill No.')
-            st.markdown(number)
+            st.markdown(bill['number'])
         with col2:
             st.markdown('##### Chamber')
-            st.markdown(chamber)
+            st.markdown(bill['chamber'])
 
     with st.container(key='name'):
         st.markdown('##### Bill Name')
-        st.markdown(name)
+        st.markdown(bill['name'])
           
     # Container for authors
     with st.container(key='authors'):
@@ -139,30 +52,34 @@ def display_bill_info(selected_rows):
         col1, col2 = st.columns(2)
         with col1:
             st.markdown('##### Author')
-            st.markdown(author)
+            st.markdown(bill['author'])
         with col2:
             st.markdown('##### Coauthor')
-            st.markdown(coauthors)
+            st.markdown(', '.join(bill['coauthors']) or 'None')
+            # party breakdown of the coauthors, looked up from the legislator index
+            parties = get_coauthor_parties(number)
+            if parties:
+                st.caption(', '.join(f'{count} {party}' for party, count in parties.items()))
       
     # Container for status
     with st.container(key='status'):
         st.markdown('##### Status')
-        st.markdown(status)
+        st.markdown(bill['status'])
       
     # Container for date and session
     with st.container(key='date_session'):
         col1, col2 = st.columns(2)
         with col1:
             st.markdown('##### Date Introduced')
-            st.markdown(date)
+            st.markdown(bill['date_introduced'])
         with col2:
             st.markdown('##### Legislative Session')
-            st.markdown(session)
+            st.markdown(bill['session'])
       
     # Button to leg info link
     with st.container(key='leginfo_link'):
         st.markdown('##### Link to Bill')
-        st.link_button('leginfo.ca.gov', str(link))
+        st.link_button('leginfo.ca.gov', bill['link'])
       
     # Expander for bill text
     with st.container(key='bill_text'):
@@ -174,24 +91,80 @@ def display_bill_info(selected_rows):
     with st.container(key='bill_history'):
         st.markdown('##### Bill History')
         expander = st.expander('See bill history')
-        expander.markdown(history)
+        expander.markdown(bill['history'])
         
    # Button to add bill to dashboard
     with st.container(key='add_to_dashboard'):
         if st.button('Add to Dashboard'):
-            # Call the function to add the bill to the dashboard and update the cache
-            add_bill_to_dashboard(number, name, author, coauthors, status, date, chamber, link, text, history)
+            # Call the function to add the bill to the dashboard
+            add_bill_to_dashboard(number)
 
 
-###############################################################################
+def view_bill_button(selected, key):
+    '''
+    Button under a bill grid where several rows can be selected, to open the Bill Info dialog
+    for the selected bill. Opening the dialog whenever one row is selected would open it on the
+    first click of every multi-selection, so it only opens when asked. Disabled unless exactly
+    one bill is selected. selected is a list of bill numbers.
+    '''
+    if st.button('View Bill Info', key=f'{key}_view', disabled=len(selected) != 1):
+        display_bill_info(selected[0])
 
-from io import BytesIO
 
-def to_csv(df) -> bytes:
+@st.dialog('Legislator Info', width='large')
+def display_legislator_info(legislator_id):
     '''
-    Downloads data from the app to csv file. To be used with st.download_button()
+    Displays a legislator's details and bill activity in a dialog pop-up box, e.g. when a row
+    is selected in the legislators grid. The numbers come from stats worked out for every
+    legislator when the data is loaded (see load_legislator_stats() in utils/legislator_data.py).
     '''
-    output = BytesIO()
-    df.to_csv(output, index=False)
-    output.seek(0)
-    return output.getvalue()
+    legislator = get_legislator(legislator_id)
+    if legislator is None:
+        st.warning(f'Legislator {legislator_id} not found.')
+        return
+    stats = get_legislator_stats(legislator_id)
+
+    # Container for name and party
+    with st.container(key='leg_name_party'):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown('##### Name')
+            st.markdown(legislator['name'])
+        with col2:
+            st.markdown('##### Party')
+            st.markdown(legislator['party'])
+
+    # Container for chamber and district
+    with st.container(key='leg_chamber_district'):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown('##### Chamber')
+            st.markdown(legislator['chamber'])
+        with col2:
+            st.markdown('##### District')
+            st.markdown(str(legislator['district']))
+
+    # Container for bill counts
+    with st.container(key='leg_bill_counts'):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric('Bills Authored', stats['authored'])
+        with col2:
+            st.metric('Bills Coauthored', stats['coauthored'])
+
+    # Status of the bills they've authored
+    with st.container(key='leg_status'):
+        st.markdown('##### Status of Authored Bills')
+        if stats['status']:
+            st.markdown('\n\n  '.join(f'{status}: {count}' for status, count in stats['status'].items()))
+        else:
+            st.markdown('None')
+
+    # Latest action on their most recently active bills
+    with st.container(key='leg_recent_activity'):
+        st.markdown('##### Recent Activity')
+        expander = st.expander('See recent activity')
+        expander.markdown('\n\n  '.join(
+            f"{activity['date']:%Y-%m-%d} >> {activity['bill_number']} ({activity['role']}): {activity['action']}"
+            for activity in stats['recent']
+        ) or 'None')
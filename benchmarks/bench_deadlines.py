@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Bill Deadlines
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Times matching bills to their next legislative calendar deadline (utils/bill_deadlines.py)
+at 10,000 bills (over two sessions) and 100 deadlines: the as-of join against a loop over
+every bill and deadline, then an incremental sync with a day's new history and status changes
+against rebuilding from all of it. Uses synthetic bills, history and deadlines, so it doesn't
+need the real data files.
+
+    $ python benchmarks/bench_deadlines.py
+"""
+
+import os
+import random
+import sys
+import time
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from utils.bill_deadlines import BillDeadlines, STAGE_DONE, leg_sessions  # noqa: E402
+
+N_BILLS = 10000
+N_DEADLINES = 100
+ENTRIES_PER_BILL = 20
+NEW_ENTRIES = 200 # history added in the incremental sync
+STATUS_CHANGES = 50 # bills whose status changes in the incremental sync
+START = pd.Timestamp('2023-01-01')
+DAYS = 1461 # two sessions
+SESSIONS = ['2023-2024', '2025-2026']
+STATUSES = ['Introduced', 'In Committee', 'Enrolled', 'Chaptered', 'Vetoed']
+ACTIONS = [
+    'Introduced. Read first time.',
+    'Referred to Com. on HOUSING.',
+    'From committee: Do pass and re-refer to Com. on APPR. (Ayes 9. Noes 0.)',
+    'April 9 set for first hearing.',
+    'In Senate. Read first time. To Com. on RLS. for assignment.',
+    'Enrolled and presented to the Governor at 3 p.m.',
+    'Chaptered by Secretary of State.',
+]
+# how often each action comes up (bills mostly stay in their house of origin)
+ACTION_WEIGHTS = [30, 30, 30, 5, 3, 1, 1]
+
+###############################################################################
+
+def make_deadlines(rng):
+    dates = pd.to_datetime(sorted(START + pd.Timedelta(days=rng.randrange(DAYS)) for _ in range(N_DEADLINES)))
+    dates = pd.Series(dates.astype('datetime64[us]'))
+    return pd.DataFrame({
+        'stage': [rng.randrange(STAGE_DONE) for _ in dates],
+        'leg_session': leg_sessions(dates),
+        'date': dates,
+        'title': [f'Deadline {i}' for i in range(N_DEADLINES)],
+    })
+
+
+def make_bills(numbers, rng):
+    return pd.DataFrame({
+        'bill_number': numbers,
+        'leg_session': rng.choices(SESSIONS, k=len(numbers)),
+        'status': rng.choices(STATUSES, weights=[40, 40, 5, 10, 5], k=len(numbers)),
+    })
+
+
+def make_history(numbers, n_entries, rng):
+    return pd.DataFrame({
+        'bill_number': [number for number in numbers for _ in range(n_entries)],
+        'date': pd.to_datetime(
+            [START + pd.Timedelta(days=rng.randrange(DAYS)) for _ in range(len(numbers) * n_entries)]
+        ).astype('datetime64[us]'),
+        'action': rng.choices(ACTIONS, weights=ACTION_WEIGHTS, k=len(numbers) * n_entries),
+    })
+
+
+def nested_loops(state, deadlines):
+    # for every live bill, walk the deadlines in date order to the first one for its session
+    # and stage on or after its latest action
+    rows = list(deadlines.itertuples(index=False))
+    matches = {}
+    stages = state[['history_stage', 'status_stage']].max(axis=1)
+    for number, session, last_date, stage in zip(state.index, state['leg_session'], state['last_date'], stages):
+        if stage == STAGE_DONE:
+            continue
+        for deadline in rows:
+            if deadline.leg_session == session and deadline.stage == stage and deadline.date >= last_date:
+                matches[number] = (deadline.date, deadline.title)
+                break
+    return matches
+
+
+def build(deadlines, history, bills):
+    bill_deadlines = BillDeadlines(deadlines)
+    bill_deadlines.sync(history, bills, version=1)
+    return bill_deadlines
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    numbers = [f'AB {i}' for i in range(1, N_BILLS + 1)]
+    deadlines = make_deadlines(rng)
+    bills = make_bills(numbers, rng)
+    history = make_history(numbers, ENTRIES_PER_BILL, rng)
+    print(f'{N_BILLS} bills, {len(history)} history entries, {N_DEADLINES} deadlines\n')
+
+    # full build: stage every bill and join against the deadlines
+    bill_deadlines, build_time = timed(build, deadlines, history, bills)
+    loop_matches, loop_time = timed(nested_loops, bill_deadlines.state, deadlines)
+    assert loop_matches == {
+        number: (row.date, row.title) for number, row in bill_deadlines.next_deadlines.iterrows()
+    }
+    _, join_time = timed(bill_deadlines._join, bill_deadlines.state.index)
+    events, events_time = timed(bill_deadlines.events)
+    print(f'{"join: nested loops (s)":>28} {loop_time:>8.3f}')
+    print(f'{"join: as-of join (s)":>28} {join_time:>8.3f}  ({len(bill_deadlines.next_deadlines)} bills with a deadline)')
+    print(f'{"full build (s)":>28} {build_time:>8.3f}  (staging from history + as-of join)')
+    print(f'{"events for the calendar (s)":>28} {events_time:>8.3f}  ({len(events)} events)\n')
+
+    # incremental: a day's new history for a few bills and a few status changes, against
+    # rebuilding from everything
+    new_history = pd.concat([history, make_history(rng.sample(numbers, NEW_ENTRIES), 1, rng)], ignore_index=True)
+    new_bills = bills.copy()
+    changed_rows = rng.sample(range(N_BILLS), STATUS_CHANGES)
+    new_bills.loc[changed_rows, 'status'] = rng.choices(STATUSES, k=STATUS_CHANGES)
+    changed, sync_time = timed(bill_deadlines.sync, new_history, new_bills, 2)
+    _, events_time = timed(bill_deadlines.events)
+    rebuilt, rebuild_time = timed(build, deadlines, new_history, new_bills)
+    assert bill_deadlines.next_deadlines.sort_index().equals(rebuilt.next_deadlines.sort_index())
+    assert bill_deadlines.state.sort_index().equals(rebuilt.state.sort_index())
+    # update() on its own, for when the caller already knows which bills changed (sync() finds
+    # them by hashing every row, which is most of its time)
+    updated = build(deadlines, history, bills)
+    _, update_time = timed(
+        updated.update, new_history[new_history['bill_number'].isin(changed)], new_bills[new_bills['bill_number'].isin(changed)]
+    )
+    assert updated.next_deadlines.sort_index().equals(rebuilt.next_deadlines.sort_index())
+    print(f'{NEW_ENTRIES} new history entries, {STATUS_CHANGES} status changes')
+    print(f'{"rebuild (s)":>28} {rebuild_time:>8.3f}')
+    print(f'{"incremental sync (s)":>28} {sync_time:>8.3f}  ({len(changed)} bills re-staged and re-joined)')
+    print(f'{"incremental update (s)":>28} {update_time:>8.3f}  (same bills, already known)')
+    print(f'{"events after sync (s)":>28} {events_time:>8.3f}')
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Exports
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Measures time and peak memory for exporting synthetic bill data with the old
+to_csv() (df.to_csv into a BytesIO, then getvalue()) and with the chunked export
+writer (utils/exports.py) for each format, at 10k and 100k rows. Each export runs in
+its own process, since peak RSS can only go up within a process. The data is
+generated once and saved to Parquet, and each process loads it from there (which
+doesn't use more memory than the loaded frame itself), so the peak reported is how
+far the process grew past the size it had with the data loaded.
+
+    $ python benchmarks/bench_exports.py
+"""
+
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from io import BytesIO
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from utils.exports import write_export  # noqa: E402
+
+ROW_COUNTS = [10_000, 100_000]
+METHODS = ['to_csv (old)', 'csv', 'parquet', 'xlsx']
+STATUSES = ['Introduced', 'In Committee', 'Chaptered', 'Vetoed']
+
+###############################################################################
+
+def make_bills(n_rows):
+    rng = random.Random(0)
+    bills = pd.DataFrame({
+        'bill_number': [f'{rng.choice(["AB", "SB"])} {i}' for i in range(n_rows)],
+        'bill_name': [f'An act to amend Section {rng.randint(1, 99999)} of the Government Code, relating to housing' for _ in range(n_rows)],
+        'author': [f'Author {rng.randint(1, 120)}' for _ in range(n_rows)],
+        'coauthors': [', '.join(f'Coauthor {rng.randint(1, 120)}' for _ in range(rng.randint(0, 6))) for _ in range(n_rows)],
+        'status': pd.Categorical([rng.choice(STATUSES) for _ in range(n_rows)]),
+        'date_introduced': [f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}' for _ in range(n_rows)],
+        'leg_session': '2023-2024',
+        'leginfo_link': [f'https://leginfo.legislature.ca.gov/faces/billNavClient.xhtml?bill_id=20230{i}' for i in range(n_rows)],
+        'chamber': pd.Categorical([rng.choice(['Assembly', 'Senate']) for _ in range(n_rows)]),
+    })
+    return bills
+
+
+def max_rss_mb():
+    # On Linux, ru_maxrss carries over the parent's peak into a child process, so read the
+    # process's own peak (VmHWM) from /proc instead
+    if os.path.exists('/proc/self/status'):
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == 'darwin' else rss / 1024
+
+
+def old_to_csv(df):
+    output = BytesIO()
+    df.to_csv(output, index=False)
+    output.seek(0)
+    return output.getvalue()
+
+
+def run_case(method, data_path):
+    '''
+    Runs one export and prints its time, peak memory growth while building the file as bytes
+    (which is what the download button gets) and file size. Runs in a child process, see
+    below.
+    '''
+    df = pd.read_parquet(data_path)
+    baseline = max_rss_mb()
+    start = time.perf_counter()
+    data = old_to_csv(df) if method == 'to_csv (old)' else write_export(df, method)
+    elapsed = time.perf_counter() - start
+    print(elapsed, max_rss_mb() - baseline, len(data) / 1024 / 1024)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) == 3:
+        run_case(sys.argv[1], sys.argv[2])
+        sys.exit()
+
+    print('Peak RSS growth (MB) while building the file\n')
+    print(f'{"rows":>8} {"method":>14} {"time (s)":>9} {"peak (MB)":>10} {"file (MB)":>10}')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for n_rows in ROW_COUNTS:
+            data_path = os.path.join(tmp_dir, f'bills_{n_rows}.parquet')
+            make_bills(n_rows).to_parquet(data_path)
+            for method in METHODS:
+                output = subprocess.run([sys.executable, __file__, method, data_path],
+                                        capture_output=True, text=True, check=True).stdout
+                elapsed, peak, size = map(float, output.split())
+                print(f'{n_rows:>8} {method:>14} {elapsed:>9.2f} {peak:>10.1f} {size:>10.1f}')
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Bill History Parsing
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Compares the history parser the app uses (build_history_table() in utils/bill_history.py:
+entries pulled out of each history_trace, dates parsed, sorted within each bill and the
+chamber carried forward) against the old row-wise chain,
+history.apply(ensure_set).apply(format_bill_history), on synthetic history_trace strings of
+increasing length. The old chain renders every bill's Markdown up front; the app renders one
+bill's history with render_history() when it's shown, so that's timed per bill.
+
+    $ python benchmarks/bench_history.py
+"""
+
+import ast
+import os
+import random
+import re
+import sys
+import time
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from utils.bill_history import build_history_table, render_history  # noqa: E402
+
+N_BILLS = 5000
+ENTRY_COUNTS = [5, 20, 50, 100]
+ACTIONS = [
+    'Introduced. Read first time.',
+    'Referred to Com. on HOUSING.',
+    'From committee: Do pass and re-refer to Com. on APPR. (Ayes 9. Noes 0.)',
+    "Read second time and amended. Author's amendments.",
+    'In Senate. Read first time. To Com. on RLS. for assignment.',
+]
+
+###############################################################################
+
+# The old row-wise chain (formerly in utils/utils.py), kept here to compare against
+
+def ensure_set(x):
+    '''
+    Converts a string to a set.
+    Needed to reformat the bill history column in the bills data set.
+    '''
+    if isinstance(x, str):
+        try:
+            # Convert string representation of a set to an actual set
+            return ast.literal_eval(x)
+        except (ValueError, SyntaxError):
+            # If it's not a valid string representation, return an empty set
+            return set()
+    elif isinstance(x, set):
+        return x
+    else:
+        # Return an empty set if the type is not recognized
+        return set()
+
+
+def format_bill_history(element_set):
+    '''
+    Reformats Bill History into a more readable/cleaner format for Streamlit,
+    with extra empty lines between entries using Markdown formatting. Necessary
+    because we use st.markdown() to display bill_history text on the streamlit app.
+    '''
+    result = ''
+    current_date = None
+
+    for element in element_set:
+        # Replace '>>' with ':' in the entire set
+        element = element.replace('>>', ':')
+
+        # Check if the element starts with a date
+        if re.match(r'^\d{4}-\d{2}-\d{2}', element):
+            # If it's a date, start a new line with Markdown-friendly formatting
+            if current_date is not None:
+                result += "\n\n  "  # Two spaces after \n forces a newline in Markdown
+
+            # Add the date element
+            result += element
+
+            # Store the date for the next iteration
+            current_date = element.split()[0].split('-')[0]
+
+    return result.strip()
+
+
+###############################################################################
+
+def make_bills(n_entries, rng):
+    entries = {
+        f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} >> {rng.choice(ACTIONS)} ({i})'
+        for i in range(n_entries)
+    }
+    return pd.DataFrame({
+        'bill_id': range(N_BILLS),
+        'bill_no': [f'AB {i}' for i in range(1, N_BILLS + 1)],
+        'chamber': 'Assembly',
+        'bill_history': repr(entries),
+    })
+
+
+def old_chain(history):
+    return history.apply(ensure_set).apply(format_bill_history)
+
+
+def render_all(table):
+    return [render_history(rows) for _, rows in table.groupby('bill_id', sort=False)]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def entry_sets(markdown):
+    return [set(line.strip() for line in text.split('\n\n')) for text in markdown]
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    print(f'{N_BILLS} bills\n')
+    print(f'{"entries/bill":>13} {"apply chain (s)":>16} {"history table (s)":>18} {"render 1 bill (ms)":>19}')
+    for n_entries in ENTRY_COUNTS:
+        bills = make_bills(n_entries, rng)
+        expected, old_time = timed(old_chain, bills['bill_history'])
+        table, table_time = timed(build_history_table, bills)
+        result, render_time = timed(render_all, table)
+        # the old chain emits entries in set order, and the table in date order, so compare
+        # entries ignoring order
+        assert entry_sets(result) == entry_sets(expected)
+        print(f'{n_entries:>13} {old_time:>16.3f} {table_time:>18.3f} {render_time / N_BILLS * 1000:>19.3f}')
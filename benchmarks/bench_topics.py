@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark: Topic Tagging
+Created on Oct 18, 2026
+@author: danyasherbini
+
+Compares tagging bills with the Aho-Corasick topic matcher (utils/topics.py) against the
+old approach of one case-insensitive regex scan per topic, as the number of topics grows.
+Uses synthetic bill names and text, so it doesn't need the real data files.
+
+    $ python benchmarks/bench_topics.py
+"""
+
+import os
+import random
+import sys
+import time
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'app'))
+from utils.topics import build_topic_index  # noqa: E402
+
+N_BILLS = 1000
+TEXT_WORDS = 300
+TERMS_PER_TOPIC = 10
+TOPIC_COUNTS = [3, 10, 30, 100]
+
+###############################################################################
+
+def make_words(n, rng):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(3, 10))) for _ in range(n)]
+
+
+def make_bills(vocab, rng):
+    return pd.DataFrame({
+        'bill_name': [' '.join(rng.choices(vocab, k=8)).title() for _ in range(N_BILLS)],
+        'full_text': [' '.join(rng.choices(vocab, k=TEXT_WORDS)) for _ in range(N_BILLS)],
+    })
+
+
+def make_taxonomy(n_topics, vocab, rng):
+    return {
+        f'Topic {i}': [' '.join(rng.sample(vocab, rng.randint(1, 2))) for _ in range(TERMS_PER_TOPIC)]
+        for i in range(n_topics)
+    }
+
+
+def regex_per_topic(bills, taxonomy):
+    # the old approach: one str.contains scan per topic (and per searched column)
+    return pd.DataFrame({
+        topic: bills['bill_name'].str.contains('|'.join(terms), na=False, case=False)
+        | bills['full_text'].str.contains('|'.join(terms), na=False, case=False)
+        for topic, terms in taxonomy.items()
+    })
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    rng = random.Random(0)
+    vocab = make_words(2000, rng)
+    bills = make_bills(vocab, rng)
+    print(f'{N_BILLS} bills, ~{TEXT_WORDS} words of text each, {TERMS_PER_TOPIC} terms per topic\n')
+    print(f'{"topics":>8} {"regex per topic (s)":>22} {"aho-corasick (s)":>18}')
+    for n_topics in TOPIC_COUNTS:
+        taxonomy = make_taxonomy(n_topics, vocab, rng)
+        expected, regex_time = timed(regex_per_topic, bills, taxonomy)
+        result, ac_time = timed(build_topic_index, bills, taxonomy)
+        assert result.equals(expected)
+        print(f'{n_topics:>8} {regex_time:>22.3f} {ac_time:>18.3f}')